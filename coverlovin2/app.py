@@ -79,39 +79,59 @@ if "pytest" not in sys.modules:
 
 import abc
 import argparse
+import asyncio
 import collections
+import concurrent.futures
+import contextlib
+import ctypes
+import ctypes.util
 import datetime
 import difflib
 import enum
+import hashlib
 import io
 import json
 import logging
+import multiprocessing
 import musicbrainzngs as mb
 import os
 from pathlib import Path
 from pprint import pformat
 import queue
 import re
+import select
 import shutil
+import signal
+import sqlite3
+import ssl
+import stat
+import struct
 import tempfile
 import threading
 import time
 from typing import (
     Any,
+    Callable,
     DefaultDict,
+    Deque,
     Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
     List,
     NamedTuple,
     NewType,
     Optional,
+    Pattern,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
 from typing_extensions import Self
 import urllib.error
 import urllib.parse
-import urllib.error
+import urllib.request
 
 #
 # vendor/3rd party imports
@@ -199,6 +219,213 @@ class WrOpts:
     test: bool = attr.ib()
 
 
+@attr.s(slots=True, frozen=True)
+class WalkOpts:
+    """Directory Walk Options - these should always travel together"""
+
+    threads: int = attr.ib(default=1)
+    """count of threads walking directories"""
+    index_path: Optional[Path] = attr.ib(default=None)
+    """`ScanIndex` database file, `None` means do not use a `ScanIndex`"""
+    index_refresh: bool = attr.ib(default=False)
+    """ignore `ScanIndex` entries, read all directories anew"""
+    index: Optional["ScanIndex"] = attr.ib(default=None, eq=False)
+    """opened `ScanIndex` of `index_path`"""
+    tagcache_path: Optional[Path] = attr.ib(default=None)
+    """`TagCache` database file, `None` means do not use a `TagCache`"""
+    tagcache_max: int = attr.ib(default=500000)
+    """`TagCache.max_entries`"""
+    tagcache: Optional["TagCache"] = attr.ib(default=None, eq=False)
+    """opened `TagCache` of `tagcache_path`"""
+    tag_processes: int = attr.ib(default=0)
+    """count of `TagPool` processes, `0` means do not use a `TagPool`"""
+    tag_chunksize: int = attr.ib(default=16)
+    """`TagPool.chunksize`"""
+    tagpool: Optional["TagPool"] = attr.ib(default=None, eq=False)
+    """started `TagPool` of `tag_processes`"""
+    excludes: Tuple[str, ...] = attr.ib(default=())
+    """gitignore-style patterns of sub-directories and files to ignore"""
+    max_depth: Optional[int] = attr.ib(default=None)
+    """do not walk deeper than this below each of DIRS, `None` means no limit"""
+    shard: Optional["Shard"] = attr.ib(default=None, eq=False)
+    """only process the album directories of this `Shard`"""
+
+
+@attr.s(slots=True, frozen=True)
+class WatchOpts:
+    """Watch Options - these should always travel together"""
+
+    watch: bool = attr.ib(default=False)
+    """after the first run, keep running and process changed directories"""
+    poll: float = attr.ib(default=0.0)
+    """poll for changes every `poll` seconds, `0` means use inotify if possible"""
+    settle: float = attr.ib(default=5.0)
+    """seconds a directory must be unchanged before it is processed"""
+
+
+@attr.s(slots=True, frozen=True)
+class JournalOpts:
+    """Journal Options - these should always travel together"""
+
+    path: Optional[Path] = attr.ib(default=None)
+    """`Journal` file, `None` means do not keep a `Journal`"""
+    resume: bool = attr.ib(default=False)
+    """skip album directories already in the `Journal`"""
+
+
+@attr.s(slots=True, frozen=True)
+class SearchOpts:
+    """Search Options - these should always travel together"""
+
+    engine: str = attr.ib(default="threads")
+    """one of `ENGINES`"""
+    concurrency: int = attr.ib(default=256)
+    """"asyncio" engine: count of album directories searched at once"""
+
+    ENGINES = ("threads", "asyncio")
+    """
+    "threads" runs each ImageSearcher in an executor thread for its medium, see
+    `SearchPools`.
+    "asyncio" runs network ImageSearchers as coroutines on one event loop, see
+    `SearchLoop`.
+    """
+
+
+@attr.s(slots=True)
+class WalkStats:
+    """
+    Directory walk statistics. Helpful for tuning `WalkOpts.threads` for a
+    particular filesystem.
+    """
+
+    dirs: int = attr.ib(default=0)
+    """count of directories read"""
+    albums: int = attr.ib(default=0)
+    """count of album directories found"""
+    time_start: float = attr.ib(factory=time.monotonic)
+    time_end: Optional[float] = attr.ib(default=None)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, repr=False, eq=False)
+
+    def dir_done(self, album: bool) -> None:
+        """a directory was read, it may be an album directory"""
+        with self._lock:
+            self.dirs += 1
+            if album:
+                self.albums += 1
+
+    def albums_found(self, count: int) -> None:
+        """`count` album directories were found after their directory was read"""
+        with self._lock:
+            self.albums += count
+
+    def stop(self) -> None:
+        self.time_end = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """seconds elapsed, up to now if not yet stopped"""
+        time_end = self.time_end if self.time_end is not None else time.monotonic()
+        return time_end - self.time_start
+
+    @property
+    def rate(self) -> float:
+        """directories read per second"""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.dirs / elapsed
+
+    def __str__(self) -> str:
+        return "Walked %d directories in %.3f seconds (%.1f directories/second)" % (
+            self.dirs,
+            self.elapsed,
+            self.rate,
+        )
+
+
+@attr.s(slots=True)
+class Shard:
+    """
+    One of `count` shards of the album directories, so several instances
+    may each process one shard of the same DIRS.
+
+    The shard of an album directory is the hash of its path relative to its
+    DIRS root, or if `by` is `"top"` then the hash of the top-level
+    directory within the DIRS root (e.g. the Artist directory). So the shard of
+    a directory does not change as other directories are added or removed.
+
+    Each shard counts the units (album directories or top-level directories)
+    seen in this shard and in other shards, and XORs the hash of each unit
+    into a checksum. If every shard is processed then the XOR of the
+    `checksum` of each shard equals `checksum_all`.
+    """
+
+    index: int = attr.ib()
+    """0-based index of this shard"""
+    count: int = attr.ib()
+    by: str = attr.ib(default="album")
+    """one of `BY`"""
+    units: int = attr.ib(default=0)
+    """count of units in this shard"""
+    units_other: int = attr.ib(default=0)
+    """count of units in other shards"""
+    checksum: int = attr.ib(default=0)
+    checksum_all: int = attr.ib(default=0)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, repr=False, eq=False)
+
+    BY = ("album", "top")
+
+    @staticmethod
+    def unit_hash(unit: str) -> int:
+        """stable 64 bit hash of `unit`, the same on every host and run"""
+        return int.from_bytes(
+            hashlib.sha1(unit.encode("utf-8", "surrogateescape")).digest()[:8], "big"
+        )
+
+    def unit(self, root: Path, dirp: Path) -> str:
+        """the unit of directory `dirp` within `root`"""
+        parts = dirp.relative_to(root).parts
+        if not parts:
+            return "."
+        if self.by == "top":
+            return parts[0]
+        return "/".join(parts)
+
+    def mine(self, root: Path, dirp: Path, count: bool = True) -> bool:
+        """
+        is directory `dirp` within `root` in this shard?
+        If `count` then count the unit of `dirp`, each unit should be counted
+        once.
+        """
+        hash_ = self.unit_hash(self.unit(root, dirp))
+        mine = hash_ % self.count == self.index
+        if count:
+            with self._lock:
+                self.checksum_all ^= hash_
+                if mine:
+                    self.units += 1
+                    self.checksum ^= hash_
+                else:
+                    self.units_other += 1
+        return mine
+
+    def __str__(self) -> str:
+        units = "album directories" if self.by == "album" else "top-level directories"
+        return (
+            "Shard %d/%d: %d %s in this shard, %d in other shards;"
+            " checksum 0x%016x of this shard, 0x%016x of all shards"
+            % (
+                self.index + 1,
+                self.count,
+                self.units,
+                units,
+                self.units_other,
+                self.checksum,
+                self.checksum_all,
+            )
+        )
+
+
 class URL(str):
     """
     string type with constraints on values.
@@ -227,11 +454,9 @@ class SearcherMedium(enum.Enum):
     """
     Distinguish the medium the ImageSearcher class uses.
 
-    TODO: someday, somehow this would assist in queuing ImageSearcher work
-          by medium. Work via NETWORK would allow many simultaneous ImageSearcher
-          instances, and work via DISK would allow fewer.
-          For now, this information is a NOOP (though a fun little exercise in
-          class organization).
+    `SearchPools` runs ImageSearcher work in an executor per medium. Work via
+    NETWORK allows many simultaneous ImageSearcher instances, and work via DISK
+    allows fewer.
     """
 
     DISK = "disk"
@@ -579,11 +804,21 @@ log = log_new(LOGFORMAT, logging.WARNING)
 REFERER_DEFAULT = __url__
 
 SEMAPHORE_COUNT_DISK = 2
+"""thread count of the SearcherMedium.DISK executor"""
 SEMAPHORE_COUNT_NETWORK = 16
-TASK_QUEUE_THREAD_COUNT = SEMAPHORE_COUNT_DISK + SEMAPHORE_COUNT_NETWORK + 1
-"""task_queue has this many threads consuming tasks"""
+"""thread count of the SearcherMedium.NETWORK executor"""
+SEARCH_PENDING_MAX = (SEMAPHORE_COUNT_DISK + SEMAPHORE_COUNT_NETWORK + 1) * 4
+"""
+a SearchEngine has at most this many tasks pending. The directory walk blocks
+when that many are pending (backpressure) so the walk does not run far ahead
+of the searches.
+"""
+IGNORE_FILE_NAME = ".coverlovinignore"
+"""gitignore-style patterns of sub-directories and files the directory walk ignores"""
+WATCH_POLL_INTERVAL = 60.0
+"""--watch polls for changes this often (seconds) if not using inotify"""
 # XXX: for help during development
-# TASK_QUEUE_THREAD_COUNT = 1
+# SEMAPHORE_COUNT_NETWORK = 1
 
 
 #
@@ -676,6 +911,215 @@ def preferences_file() -> Tuple[Path, Any]:
     return path_, pref
 
 
+def cache_dir() -> Path:
+    """
+    find the most suitable directory for cache files, e.g. `ScanIndex`.
+    Return a `NAME` sub-directory of it, created if necessary.
+    """
+    # Linux
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    home = Path.home()
+    tmpd = Path(tempfile.gettempdir())
+    # Windows
+    localappdata = os.environ.get("LOCALAPPDATA")
+    # search in order of preferred path
+    for cached in (
+        xdg_cache_home,
+        localappdata,
+        home.joinpath(".cache"),
+        tmpd,
+    ):
+        if not cached:
+            continue
+        cached_ = Path(cached)
+        if cached_.is_dir() and os.access(cached_, os.W_OK):
+            cached_ = cached_.joinpath(NAME)
+            cached_.mkdir(exist_ok=True)
+            return cached_
+    raise RuntimeError("No writeable cache directory found")
+
+
+class Journal:
+    """
+    Append-only journal of album directories done, one JSON object per line.
+    Written by the `SearchEngine` as each `Result` is done so an
+    interrupted run may be resumed, see `load`.
+
+    Lines are flushed to the file at most `FLUSH_INTERVAL` seconds after
+    written, by a timer if no later line is written, and during `close`. A
+    partially written last line (e.g. the process was killed) is ignored by
+    `load`.
+    """
+
+    QNAME = __qualname__
+    FILE_NAME = "journal.jsonl"
+    FLUSH_INTERVAL = 2.0
+
+    path: Path
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        open the journal file `path`. If `resume` then append to it, otherwise
+        the journal is begun anew.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._flushed = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        log.debug('%s: open "%s"', self.QNAME, path)
+
+    @staticmethod
+    def load(path: Path) -> Dict[Path, Dict[str, Any]]:
+        """
+        read the journal file `path`.
+        return album directories journaled, and the journaled entry of each.
+        """
+        done: Dict[Path, Dict[str, Any]] = {}
+        try:
+            with open(path, encoding="utf-8") as f_:
+                for line in f_:
+                    try:
+                        entry = json.loads(line)
+                        done[Path(entry["path"])] = entry
+                    except (ValueError, KeyError, TypeError):
+                        log.debug('%s: skip bad line in "%s"', Journal.QNAME, path)
+        except FileNotFoundError:
+            pass
+        return done
+
+    def append(self, result: Result) -> None:
+        """journal the album directory of `result` as done"""
+        entry = {
+            "path": str(result.image_path.parent),
+            "image_path": str(result.image_path),
+            "ok": bool(result),
+            "message": result.message,
+            "artist": result.artalb[0] if result.artalb else None,
+            "album": result.artalb[1] if result.artalb else None,
+            "time": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            since = time.monotonic() - self._flushed
+            if since >= self.FLUSH_INTERVAL:
+                self._flush()
+            elif self._timer is None:
+                # flush this line even if no later line is written
+                self._timer = threading.Timer(self.FLUSH_INTERVAL - since, self._flush_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._file.closed:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._flushed = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+        log.debug('%s: closed "%s"', self.QNAME, self.path)
+
+
+class SqliteStore(abc.ABC):
+    """
+    Base class for on-disk stores kept in a SQLite database file.
+
+    One connection is shared by all threads, guarded by `self._lock`.
+    Writes are committed every `COMMIT_EVERY` writes and during `close`.
+    If the database file has a different `SCHEMA_VERSION` then the tables are
+    dropped and created anew, i.e. the store is emptied.
+    """
+
+    QNAME: str = __qualname__
+    SCHEMA_VERSION: int = 1
+    SCHEMA: Sequence[str] = ()
+    """SQL statements that create the tables"""
+    TABLES: Sequence[str] = ()
+    """tables created by `SCHEMA`"""
+    COMMIT_EVERY = 500
+
+    path: Path
+    _conn: sqlite3.Connection
+    _lock: threading.RLock
+    _writes: int
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._writes = 0
+        log.debug('%s: open "%s"', self.QNAME, path)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                if version:
+                    log.info(
+                        '%s: schema version %s of "%s" is not %s, recreating',
+                        self.QNAME,
+                        version,
+                        path,
+                        self.SCHEMA_VERSION,
+                    )
+                for table in self.TABLES:
+                    self._conn.execute("DROP TABLE IF EXISTS %s" % table)
+                for sql in self.SCHEMA:
+                    self._conn.execute(sql)
+                self._conn.execute("PRAGMA user_version = %d" % self.SCHEMA_VERSION)
+                self._conn.commit()
+
+    def _write(self, sql: str, parameters: Sequence[Any] = ()) -> int:
+        """
+        execute a write, commit every `COMMIT_EVERY` writes.
+        return count of rows changed.
+        """
+        with self._lock:
+            rowcount = self._conn.execute(sql, parameters).rowcount
+            self._writes += 1
+            if self._writes >= self.COMMIT_EVERY:
+                self._conn.commit()
+                self._writes = 0
+            return rowcount
+
+    def _read(self, sql: str, parameters: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._writes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+        log.debug('%s: closed "%s"', self.QNAME, self.path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
 #
 # audio file types (i.e. file name extensions)
 #
@@ -911,6 +1355,8 @@ get_artist_album = {
     ".asf": get_artist_album_asf,
 }
 AUDIO_TYPES = list(get_artist_album.keys())
+AUDIO_TYPES_SET = frozenset(AUDIO_TYPES)
+"""for quick membership checks of file name extensions"""
 
 
 def sanitise(param: str):
@@ -928,6 +1374,255 @@ def similar(title1: str, title2: str) -> float:
     return difflib.SequenceMatcher(None, title1, title2).ratio()
 
 
+class HttpResponse(NamedTuple):
+    """response of `http_get_async`"""
+
+    url: str
+    """final URL, after redirects"""
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    """header names are lowercase"""
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+HTTP_REDIRECTS = frozenset((301, 302, 303, 307, 308))
+HTTP_USER_AGENT = "%s ( %s )" % (__product_token__, __url__)
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+async def _http_get_once(url: str, headers: Dict[str, str]) -> HttpResponse:
+    """one HTTP/1.1 GET request on a new connection, no redirects"""
+    global _ssl_context
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("bad URL %r" % url)
+    ssl_ = None
+    if parts.scheme == "https":
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        ssl_ = _ssl_context
+    port = parts.port or (443 if ssl_ else 80)
+    reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=ssl_)
+    try:
+        target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        headers_ = {
+            "Host": parts.netloc,
+            "User-Agent": HTTP_USER_AGENT,
+            "Accept-Encoding": "identity",
+            "Connection": "close",
+        }
+        headers_.update(headers)
+        request = "GET %s HTTP/1.1\r\n" % target
+        request += "".join("%s: %s\r\n" % (k, v) for k, v in headers_.items())
+        writer.write((request + "\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        version, _, status_reason = status_line.partition(" ")
+        if not version.startswith("HTTP/"):
+            raise ConnectionError("bad HTTP status line %r from %r" % (status_line, url))
+        status, _, reason = status_reason.partition(" ")
+        resp_headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            resp_headers[name.strip().lower()] = value.strip()
+
+        if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in resp_headers:
+            body = await reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            body = await reader.read()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+    return HttpResponse(url, int(status), reason, resp_headers, body)
+
+
+def _http_proxied(url: str) -> bool:
+    """is a proxy set for `url` by the environment, e.g. variable HTTPS_PROXY"""
+    parts = urllib.parse.urlsplit(url)
+    proxies = urllib.request.getproxies()
+    return parts.scheme in proxies and not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _http_get_urllib(url: str, headers: Dict[str, str], timeout: float) -> HttpResponse:
+    """`http_get_async` by way of urllib, which handles proxies"""
+    headers_ = {"User-Agent": HTTP_USER_AGENT}
+    headers_.update(headers)
+    request = urllib.request.Request(url, headers=headers_)
+    # not `urlopen`, its opener keeps the proxies of the environment when first called
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler(urllib.request.getproxies()))
+    try:
+        response = opener.open(request, None, timeout)
+    except urllib.error.HTTPError as err:
+        response = err
+    with response:
+        return HttpResponse(
+            response.geturl(),
+            response.getcode(),
+            response.reason,
+            {k.lower(): v for k, v in response.headers.items()},
+            response.read(),
+        )
+
+
+async def http_get_async(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10.0,
+    redirects: int = 5,
+) -> HttpResponse:
+    """
+    Minimal asyncio HTTP GET client. One connection per request, follows up to
+    `redirects` redirects. Raises upon connection failure or `timeout` seconds
+    passing. A response with an error status is returned, not raised.
+
+    If the environment sets a proxy for `url` (variables HTTP_PROXY,
+    HTTPS_PROXY, NO_PROXY) then the request is done by urllib in the default
+    executor.
+    """
+    headers = headers or {}
+    if _http_proxied(url):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _http_get_urllib, url, headers, timeout)
+    for _ in range(redirects + 1):
+        response = await asyncio.wait_for(_http_get_once(url, headers), timeout)
+        if response.status not in HTTP_REDIRECTS or "location" not in response.headers:
+            return response
+        url = urllib.parse.urljoin(url, response.headers["location"])
+    raise ConnectionError("too many redirects for %r" % url)
+
+
+def retry_after(headers: Dict[str, str], default: float) -> float:
+    """
+    Return the seconds of the Retry-After response header, else `default`.
+    `headers` names are lowercase.
+    """
+    try:
+        return max(0.0, float(headers["retry-after"]))
+    except (KeyError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    Token bucket rate-limiter of requests to one provider.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens per
+    second. Each request takes a token. When the bucket is empty a request
+    reserves the next token to be refilled and waits for it. So requests go at
+    once while budget remains, then are spread evenly at `rate`, instead of
+    going in a burst and then stalling for the rest of the provider's
+    rate-limit window.
+
+    `reserve` does not block, it returns the seconds to wait. Threads wait with
+    `acquire` and coroutines with `acquire_async`, and both may share one
+    RateLimiter.
+    """
+
+    QNAME: str = __qualname__
+
+    def __init__(self, name: str, rate: float, burst: int = 1):
+        """
+        :param name: provider name, for logging
+        :param rate: tokens per second
+        :param burst: most tokens the bucket holds
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._time = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        """count of tokens taken"""
+        self.waited = 0.0
+        """sum of seconds requests were told to wait"""
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._time) * self.rate)
+        self._time = now
+
+    def reserve(self) -> float:
+        """take a token, return the seconds to wait before using it"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            self.requests += 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.waited += wait
+        return wait
+
+    def acquire(self) -> float:
+        """take a token, sleep until it may be used, return seconds slept"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Coroutine version of `acquire`"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update(self, limit: Optional[int], remaining: Optional[int], window: float) -> None:
+        """
+        Update from the provider's rate-limit response headers, which count
+        requests of other clients too.
+
+        :param limit: requests allowed per `window`, sets `rate`
+        :param remaining: requests remaining in the current `window`, the
+                          bucket holds no more tokens than this
+        :param window: seconds
+        """
+        with self._lock:
+            self._refill()
+            if limit:
+                self.rate = limit / window
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+
+    def penalize(self, seconds: float) -> None:
+        """
+        The provider refused a request for exceeding its rate-limit. The next
+        request waits at least `seconds`.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def __str__(self) -> str:
+        return "%s rate-limit %.2f requests/second, waited %.1f seconds over %d requests" % (
+            self.name,
+            self.rate,
+            self.waited,
+            self.requests,
+        )
+
+
 class ImageSearcher(abc.ABC):
     """
     Base class for implementations for image searching.
@@ -975,6 +1670,40 @@ class ImageSearcher(abc.ABC):
     def search_album_image(self) -> bytes:
         raise NotImplementedError("child class failed to implement abstractmethod")
 
+    async def go_async(self) -> Optional[Result]:
+        """
+        Coroutine version of `go` for the "asyncio" engine. Runs `go` in the
+        event loop's default executor. Network ImageSearchers override this.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.go)
+
+    async def write_album_image_async(self, image_path: Path) -> Result:
+        """`write_album_image` in the event loop's default executor"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.write_album_image, image_path
+        )
+
+    @staticmethod
+    async def download_url_async(url: URL, log_: logging.Logger) -> bytes:
+        """
+        Coroutine version of `download_url`.
+        """
+
+        if not url:
+            raise ValueError("bad URL %r" % url)
+
+        try:
+            log_.info('image download http_get_async("%s")', url)
+            response = await http_get_async(url, timeout=10)
+        except Exception as err:
+            log_.exception(err, exc_info=True)
+            return bytes()
+        if not response.ok:
+            log_.warning('image download returned %s %s for "%s"', response.status, response.reason, url)
+            return bytes()
+
+        return response.body
+
     @staticmethod
     def download_url(url: URL, log_: logging.Logger) -> bytes:
         """
@@ -1528,18 +2257,12 @@ class ImageSearcher_GoogleCSE(ImageSearcher_Medium_Network):
         """
         return urllib.request.urlopen(request, *args, **kwargs)
 
-    @overrides(ImageSearcher)
-    def search_album_image(self) -> bool:
-        self._log.debug("search_album_image() %s", str_ArtAlb(self.artalb))
-
-        if self.artalb == ArtAlb_empty:
-            return False
-
-        # construct the URL
+    def _search_url(self) -> URL:
+        """the Google CSE search URL for `self.artalb`"""
         # URI parameters documented at
         # https://developers.google.com/custom-search/v1/using_rest
         # (http://archive.fo/Ljx73)
-        url = URL(
+        return URL(
             ImageSearcher_GoogleCSE.google_search_api
             + "?"
             + "key="
@@ -1561,38 +2284,31 @@ class ImageSearcher_GoogleCSE(ImageSearcher_Medium_Network):
             + "&num="
             + str(1)
         )
-        request = self.RequestClass(url, data=None, headers={"Referer": self.referer})
-
-        # make request from the provided url
-        try:
-            self._log.info('Google CSE urllib.request.urlopen("%s")', request.full_url)
-            response = self._search_response_json(request, data=None, timeout=5)
-        except urllib.error.HTTPError:
-            return False
-        except Exception as err:
-            self._log.exception('Error %s returned for url "%s"', str(err), url)
-            return False
 
+    def _image_urls(self, resp: bytes, url: URL) -> List[URL]:
+        """
+        Return the image URLs within the search response `resp`, the original
+        image link then the Google-hosted thumbnail.
+        """
         # load json response results into python dict
         try:
-            resp = response.read()
             resp_json = json.loads(resp)
         except Exception as err:
             self._log.warning('Error during json loading: %s\nfor url "%s"', str(err), url)
-            return False
+            return []
 
         if not resp_json:
             self._log.debug("response json is empty")
-            return False
+            return []
         if not type(resp_json) is dict:
             self._log.debug("response json is not a dict")
-            return False
+            return []
         if "items" not in resp_json:
             self._log.debug('response json has no "items" key')
-            return False
+            return []
         if len(resp_json["items"]) == 0:
             self._log.debug('response json ["items"] has no entries')
-            return False
+            return []
 
         # get the original image link and the Google-hosted thumbnail
         img_urls = []
@@ -1604,11 +2320,39 @@ class ImageSearcher_GoogleCSE(ImageSearcher_Medium_Network):
             img_urls.append(item0["image"]["thumbnailLink"])
         if "title" in item0:
             title = item0["title"]
+        self._log.debug('found images for resource titled "%s"', title)
+        return img_urls
+
+    @overrides(ImageSearcher)
+    def search_album_image(self) -> bool:
+        self._log.debug("search_album_image() %s", str_ArtAlb(self.artalb))
+
+        if self.artalb == ArtAlb_empty:
+            return False
+
+        # construct the URL
+        url = self._search_url()
+        request = self.RequestClass(url, data=None, headers={"Referer": self.referer})
+
+        # make request from the provided url
+        try:
+            self._log.info('Google CSE urllib.request.urlopen("%s")', request.full_url)
+            response = self._search_response_json(request, data=None, timeout=5)
+        except urllib.error.HTTPError:
+            return False
+        except Exception as err:
+            self._log.exception('Error %s returned for url "%s"', str(err), url)
+            return False
+
+        try:
+            resp = response.read()
+        except Exception as err:
+            self._log.warning('Error during response reading: %s\nfor url "%s"', str(err), url)
+            return False
 
         # try to download the original image link, failing that try the
         # Google-hosted thumbnail image
-        self._log.debug('downloading image for resource titled "%s"', title)
-        for url in img_urls:
+        for url in self._image_urls(resp, url):
             bytes_ = self.download_url(url, self._log)
             if bytes_:
                 self._image_bytes = bytes_
@@ -1616,6 +2360,37 @@ class ImageSearcher_GoogleCSE(ImageSearcher_Medium_Network):
 
         return True if self._image_bytes else False
 
+    @overrides(ImageSearcher)
+    async def go_async(self) -> Optional[Result]:
+        if not await self.search_album_image_async():
+            return None
+        return await self.write_album_image_async(self.image_path)
+
+    async def search_album_image_async(self) -> bool:
+        """Coroutine version of `search_album_image`"""
+        self._log.debug("search_album_image_async() %s", str_ArtAlb(self.artalb))
+
+        if self.artalb == ArtAlb_empty:
+            return False
+
+        url = self._search_url()
+        try:
+            self._log.info('Google CSE http_get_async("%s")', url)
+            response = await http_get_async(url, {"Referer": self.referer}, timeout=5)
+        except Exception as err:
+            self._log.exception('Error %s returned for url "%s"', str(err), url)
+            return False
+        if not response.ok:
+            return False
+
+        for url in self._image_urls(response.body, url):
+            bytes_ = await self.download_url_async(url, self._log)
+            if bytes_:
+                self._image_bytes = bytes_
+                break
+
+        return True if self._image_bytes else False
+
 
 class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
     QNAME = __qualname__
@@ -1627,6 +2402,13 @@ class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
         self.image_path = image_path
         super().__init__(artalb, image_type, wropts, loglevel)
 
+    limiter: RateLimiter = RateLimiter("musicbrainz.org", 1.0)
+    """MusicBrainz web service allows about one request per second"""
+    URL_WS = "https://musicbrainz.org/ws/2"
+    """MusicBrainz web service, used by `search_album_image_async`"""
+    URL_CAA = "https://coverartarchive.org"
+    """Cover Art Archive, used by `search_album_image_async`"""
+
     @classmethod
     # @overrides(ImageSearcher_Medium_Network)
     def provider(cls) -> str:
@@ -1640,32 +2422,90 @@ class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
 
     def _search_artists(self, mb, artist: Artist) -> Dict[Any, Any]:
         """extract this function call to allow for pytest stubbing"""
+        self.limiter.acquire()
         self._log.debug('· mb.search_artists(query="%s", limit=1)', artist)
         return mb.search_artists(query=artist, limit=1)
 
     def _browse_releases(self, mb, artist_id: str) -> Dict[Any, Any]:
         """extract this function call to allow for pytest stubbing"""
+        self.limiter.acquire()
         self._log.debug('· mb.browse_releases(artist="%s", limit=500)', artist_id)
         return mb.browse_releases(artist=artist_id, limit=500)
 
-    @overrides(ImageSearcher)
-    def search_album_image(self) -> bool:
-        """There are a number of ways to use the musicbrainz searching and
-        browse API functions.
-        The particular order of operations here appears
-        seemed to be reasonably accurate. First, search on Artist string for an
-        Artist ID then search on Album string confined to that Artist ID.
-        Trying to search with just one API call using with Album+Artist string
-        yields too many ambiguous results.
-
-        TODO: XXX: this does not account for different image types!
-                   only returns .jpg
+    def _browse_release_groups(self, mb, artist_id: str) -> Dict[Any, Any]:
+        """extract this function call to allow for pytest stubbing"""
+        self.limiter.acquire()
+        self._log.debug('· mb.browse_release_groups(artist="%s", limit=100)', artist_id)
+        return mb.browse_release_groups(artist=artist_id, limit=100)
 
-        :return: found image or not?
+    def _album_id_best(self, album: Album, entries: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Return the "id" of the release or release-group entry with the title
+        most `similar` to `album`, or None if none are similar enough.
         """
+        # store tuple pairs of (`similar` score, release/release_group entry)
+        score_album = []
+        for e_ in entries:
+            score = similar(e_.get("title", ""), album)
+            if score >= 0.4:
+                score_album.append((score, e_))
+        if not score_album:
+            return None
+        score_album.sort(key=lambda x: x[0], reverse=True)
+        # TODO: further refinement would be to disclude entries that explicitly
+        #       do not have an associated 'cover-art-archive', e.g.
+        #       ['release-list'][x]['cover-art-archive']['artwork'] == 'false'
 
-        artist = self.artalb[0]
-        album = self.artalb[1]
+        # index 0 has most `similar` album by title string
+        try:
+            return score_album[0][1]["id"]
+        except KeyError as ke:
+            self._log.exception(ke, exc_info=True)
+            return None
+
+    def _image_url(
+        self, image_list: Any, artist: Artist, album: Album, album_id: str
+    ) -> Optional[URL]:
+        """return the first image URL of the Cover Art Archive `image_list`"""
+        # do this once
+        dmsg = 'for %s MusicBrainz album  ID "%s"' % (str_AA(artist, album), album_id)
+        # assume the first url available is the best
+        if not image_list:
+            self._log.debug("unable to find an image URL " + dmsg)
+            return None
+        if type(image_list) is not dict:
+            self._log.debug("unexected type returned " + dmsg)
+            return None
+        if "images" not in image_list:
+            self._log.debug('"images" key not in returned list ' + dmsg)
+            return None
+        if len(image_list["images"]) < 1:
+            self._log.debug('list of "images" has no entries ' + dmsg)
+            return None
+        image0 = image_list["images"][0]
+        if "image" not in image0:
+            self._log.debug('images[0] has no "image" entry for %s ' + dmsg)
+            return None
+        return image0["image"]
+
+    @overrides(ImageSearcher)
+    def search_album_image(self) -> bool:
+        """There are a number of ways to use the musicbrainz searching and
+        browse API functions.
+        The particular order of operations here appears
+        seemed to be reasonably accurate. First, search on Artist string for an
+        Artist ID then search on Album string confined to that Artist ID.
+        Trying to search with just one API call using with Album+Artist string
+        yields too many ambiguous results.
+
+        TODO: XXX: this does not account for different image types!
+                   only returns .jpg
+
+        :return: found image or not?
+        """
+
+        artist = self.artalb[0]
+        album = self.artalb[1]
 
         # XXX: these next two checks are an easy way out of making a complicated
         #      search for these special cases
@@ -1688,6 +2528,9 @@ class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
         #     non-official and may change at any time
         # as of musicbrainzngs==0.6
         mb.set_format(fmt="xml")
+        # requests are rate-limited by `self.limiter` instead, which does not
+        # hold a lock while waiting
+        mb.set_rate_limit(False)
         artist_list = self._search_artists(mb, artist)
 
         # verify results exist before attempting to use them
@@ -1743,37 +2586,11 @@ class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
             )
             return False
 
-        possible = list(
-            filter(lambda rle: similar(rle["title"], album) >= 0.4, releases["release-list"])
-        )
-        self._log.debug('· mb.browse_release_groups(artist="%s", limit=500)', artist_id)
-        release_groups = mb.browse_release_groups(artist=artist_id, limit=100)
-        possible += list(
-            filter(
-                lambda rgle: similar(rgle["title"], album) >= 0.4,
-                release_groups["release-group-list"],
-            )
+        release_groups = self._browse_release_groups(mb, artist_id)
+        album_id = self._album_id_best(
+            album, releases["release-list"] + release_groups["release-group-list"]
         )
-
-        # store tuple pairs of (`similar` score, release/release_group entry)
-
-        score_album = []
-        for p_ in possible:
-            # XXX: slightly inefficient because the `similar` function was
-            #      called with the same information earlier. good enough.
-            score_album.append((similar(p_["title"], album), p_))
-        if not score_album:
-            return False
-        score_album.sort(key=lambda x: x[0], reverse=True)
-        # TODO: further refinement would be to disclude entries that explicitly
-        #       do not have an associated 'cover-art-archive', e.g.
-        #       ['release-list'][x]['cover-art-archive']['artwork'] == 'false'
-
-        # index 0 has most `similar` album by title string
-        try:
-            album_id = score_album[0][1]["id"]
-        except IndexError as ie:
-            self._log.exception(ie, exc_info=True)
+        if not album_id:
             return False
 
         # try several sources for the image
@@ -1793,35 +2610,95 @@ class ImageSearcher_MusicBrainz(ImageSearcher_Medium_Network):
             )
             pass
 
-        # do this once
-        dmsg = 'for %s MusicBrainz album  ID "%s"' % (str_AA(artist, album), album_id)
-        # assume the first url available is the best
-        if not image_list:
-            self._log.debug("unable to find an image URL " + dmsg)
-            return False
-        if type(image_list) is not dict:
-            self._log.debug("unexected type returned " + dmsg)
+        url = self._image_url(image_list, artist, album, album_id)
+        if not url:
             return False
-        if "images" not in image_list:
-            self._log.debug('"images" key not in returned list ' + dmsg)
+
+        self._image_bytes = self.download_url(url, self._log)
+
+        return True if self._image_bytes else False
+
+    @overrides(ImageSearcher)
+    async def go_async(self) -> Optional[Result]:
+        if not await self.search_album_image_async():
+            return None
+        return await self.write_album_image_async(self.image_path)
+
+    async def _get_json_async(self, url: str) -> Any:
+        """
+        GET the JSON document at `url`, None upon failure. Requests of the
+        MusicBrainz web service are rate-limited by `limiter`.
+        """
+        limited = url.startswith(self.URL_WS)
+        if limited:
+            await self.limiter.acquire_async()
+        try:
+            self._log.debug('· http_get_async("%s")', url)
+            response = await http_get_async(url, {"Accept": "application/json"})
+        except Exception as err:
+            self._log.debug('Error %s returned for url "%s"', str(err), url)
+            return None
+        if limited and response.status in (429, 503):
+            self.limiter.penalize(retry_after(response.headers, 1.0))
+        if not response.ok:
+            self._log.debug('%s %s returned for url "%s"', response.status, response.reason, url)
+            return None
+        try:
+            return json.loads(response.body)
+        except Exception as err:
+            self._log.warning('Error during json loading: %s\nfor url "%s"', str(err), url)
+            return None
+
+    async def search_album_image_async(self) -> bool:
+        """
+        Coroutine version of `search_album_image`. Requests the MusicBrainz
+        JSON web service and the Cover Art Archive directly, the same steps as
+        `search_album_image`.
+        """
+        artist = self.artalb[0]
+        album = self.artalb[1]
+        if not artist or not album:
             return False
-        if len(image_list["images"]) < 1:
-            self._log.debug('list of "images" has no entries ' + dmsg)
+
+        artist_list = await self._get_json_async(
+            self.URL_WS
+            + "/artist/?"
+            + urllib.parse.urlencode({"query": artist, "limit": 1, "fmt": "json"})
+        )
+        try:
+            artist_id = artist_list["artists"][0]["id"]
+        except (KeyError, IndexError, TypeError):
+            self._log.debug('artist search for "%s" returned no artist "id"', artist)
             return False
-        image0 = image_list["images"][0]
-        if "image" not in image0:
-            self._log.debug('images[0] has no "image" entry for %s ' + dmsg)
+
+        # the web service returns at most 100 entries per browse request
+        entries: List[Dict[str, Any]] = []
+        for entity in ("release", "release-group"):
+            browse = await self._get_json_async(
+                self.URL_WS
+                + "/%s?" % entity
+                + urllib.parse.urlencode({"artist": artist_id, "limit": 100, "fmt": "json"})
+            )
+            if type(browse) is dict and type(browse.get(entity + "s")) is list:
+                entries += browse[entity + "s"]
+        album_id = self._album_id_best(album, entries)
+        if not album_id:
             return False
-        url = image0["image"]
 
-        self._image_bytes = self.download_url(url, self._log)
+        # try several sources for the image
+        image_list: Dict = dict()
+        for entity in ("release", "release-group"):
+            image_list_ = await self._get_json_async(self.URL_CAA + "/%s/%s" % (entity, album_id))
+            if type(image_list_) is dict:
+                image_list.update(image_list_)
 
-        return True if self._image_bytes else False
+        url = self._image_url(image_list, artist, album, album_id)
+        if not url:
+            return False
 
+        self._image_bytes = await self.download_url_async(url, self._log)
 
-# discogs HTTP requests must handle rate-limit
-# this is a slightly inefficient way to simplify handling the rate-limit response value
-Discogs_Request_Lock = threading.RLock()
+        return True if self._image_bytes else False
 
 
 class Discogs_Downloader(abc.ABC):
@@ -1853,16 +2730,19 @@ class Discogs_Downloader(abc.ABC):
 
     See https://www.discogs.com/developers/#page:home,header:home-rate-limiting
 
-    Because of rate-limiting, a global `Discogs_Request_Lock` is used to coordinate
-    Discogs requests, and the necessary sleeps when the X-Discogs-Ratelimit-Used goes to 0.
-    If not for the rate-limiting, this class could just use then requests.Session
-    to handle the multi-threaded requests.
-    Currently, this causes only one discogs.com HTTP request to occur at a time, which is
-    somewhat inefficient but also easiest to implement.
+    Because of rate-limiting, all Discogs requests take a token from the class-wide
+    `limiter`. The `limiter` is refilled at the rate of X-Discogs-Ratelimit and holds
+    no more than X-Discogs-Ratelimit-Remaining tokens. Requests go at once while
+    budget remains, then are spread over the rate-limit window.
     """
     k_header_ratelimit_remain = "X-Discogs-Ratelimit-Remaining"
-    k_header_ratelimit_used = "X-Discogs-Ratelimit-Used"
-    Ratelimit_Reset_Wait = 60 + 1  # wait time in seconds
+    Ratelimit_Window = 60.0
+    """seconds of the discogs.com moving rate-limit window"""
+    Ratelimit_Backoff = 5.0
+    """seconds to wait after a 429 response without a Retry-After header"""
+
+    limiter: RateLimiter = RateLimiter("discogs.com", 60 / Ratelimit_Window, 5)
+    """class-wide rate-limiter of all discogs.com requests"""
 
     __Session: requests.Session = requests.Session()
     """
@@ -1872,7 +2752,6 @@ class Discogs_Downloader(abc.ABC):
 
          Thread-safe connection pool for one host.
     """
-    __Session.rate_limit_time_last = float(0)
 
     def __init__(self, loglevel: int):
         self._logname = self.QNAME + "(0x%08x)" % id(self)
@@ -1883,53 +2762,73 @@ class Discogs_Downloader(abc.ABC):
     def _session(self) -> requests.Session:
         return self.__Session
 
-    def _ratelimit_wait(self) -> None:
-        if self._session.rate_limit_time_last != 0:
-            wait_another = Discogs_Downloader.Ratelimit_Reset_Wait - (
-                time.time() - self._session.rate_limit_time_last
-            )
-            self._log.debug("Waiting %.3fs to so Discogs servers reset rate-limit…", wait_another)
-            while Discogs_Downloader.Ratelimit_Reset_Wait > (
-                time.time() - self._session.rate_limit_time_last
-            ):
-                time.sleep(1)
-            self._session.rate_limit_time_last = float(0)
-            self._log.debug("Session.rate_limit_time_last has been reset to 0")
-        else:
-            self._log.debug("Session.rate_limit_time_last is 0; skip waiting")
-
-    def _ratelimit_update(self, remain: Optional[int]) -> None:
-        self._log.debug("X-Discogs-Ratelimit-Remaining is %s", remain)
-        if remain is None or remain > 1:
+    def _ratelimit_update(self, headers: Dict[str, str], status: int) -> None:
+        """
+        Update the `limiter` from the X-Discogs-Ratelimit response headers.
+        `headers` names are lowercase.
+        """
+        limit = None
+        remain = None
+        try:
+            k_limit = Discogs_Downloader.k_header_ratelimit.lower()
+            k_remain = Discogs_Downloader.k_header_ratelimit_remain.lower()
+            if k_limit in headers:
+                limit = int(headers[k_limit])
+            if k_remain in headers:
+                remain = int(headers[k_remain])
+        except ValueError:
+            self._log.exception("failed to parse X-Discogs-Ratelimit headers")
             return
-        self._session.rate_limit_time_last = time.time()
-        self._log.debug("Updated Discogs wait time to %.3f", self._session.rate_limit_time_last)
+        self._log.debug(
+            "X-Discogs-Ratelimit is %s, X-Discogs-Ratelimit-Remaining is %s", limit, remain
+        )
+        self.limiter.update(limit, remain, Discogs_Downloader.Ratelimit_Window)
+        if status == 429:
+            backoff = retry_after(headers, Discogs_Downloader.Ratelimit_Backoff)
+            self._log.warning("discogs.com rate-limit exceeded, waiting %.1fs", backoff)
+            self.limiter.penalize(backoff)
 
-    def _do_request(self, request: requests.Request) -> requests.Response:
+    async def _do_request_async(self, url: str, headers: Headers) -> HttpResponse:
         """
-        safe-wrapper for `self.__do_request_unsafe`
+        Coroutine version of `_do_request`.
         """
-        global Discogs_Request_Lock
-        self._log.debug("Discogs_Request_Lock.acquire()…")
-        if not Discogs_Request_Lock.acquire():
-            raise RuntimeError("Failed to Discogs_Request_Lock.acquire() during _ratelimit_wait")
-        try:
-            self._log.debug("Discogs_Request_Lock.acquired")
-            response = self.__do_request_unsafe(request)
-        finally:
-            self._log.debug("Discogs_Request_Lock.release()")
-            Discogs_Request_Lock.release()
+        wait = await self.limiter.acquire_async()
+        if wait:
+            self._log.debug("Waited %.3fs for the discogs.com rate-limit", wait)
+        self._log.debug("request: GET '%s'", url)
+        response = await http_get_async(url, headers)
+        self._log.debug(
+            "response: '%s' %s %s content-type: %s",
+            response.url,
+            response.status,
+            response.reason,
+            response.headers.get("content-type", ""),
+        )
+        if not response.ok:
+            self._log.error(
+                "Discogs request returned %s %s for '%s'", response.status, response.reason, url
+            )
+        self._ratelimit_update(response.headers, response.status)
         return response
 
-    def __do_request_unsafe(self, request: requests.Request) -> requests.Response:
+    def _do_request(self, request: requests.Request) -> requests.Response:
+        """
+        Wait for the discogs.com rate-limit `limiter`, then
+        `self.__do_request_send`. Requests of many threads go at once while
+        the `limiter` has budget.
+        """
+        wait = self.limiter.acquire()
+        if wait:
+            self._log.debug("Waited %.3fs for the discogs.com rate-limit", wait)
+        return self.__do_request_send(request)
+
+    def __do_request_send(self, request: requests.Request) -> requests.Response:
         """
         Perform an HTTP Request with much debug logging.
-        Handles discogs.com rate-limit throttling.
+        Updates the discogs.com rate-limit `limiter`.
         """
         prequest = request.prepare()
 
-        self._ratelimit_wait()
-
         headers_text = ""
         if self._log.isEnabledFor(logging.DEBUG):
             headers_text = pformat(
@@ -2012,15 +2911,9 @@ response:
                 prequest.url,
             )
 
-        remain = None
-        try:
-            if Discogs_Downloader.k_header_ratelimit_remain in response.headers:
-                remain = int(response.headers[Discogs_Downloader.k_header_ratelimit_remain])
-        except Exception:
-            self._log.exception("failed to parse X-Discogs-Ratelimit headers")
-            return response
-
-        self._ratelimit_update(remain)
+        self._ratelimit_update(
+            {h.lower(): v for h, v in response.headers.items()}, response.status_code
+        )
 
         return response
 
@@ -2136,6 +3029,15 @@ response:
             "child class failed to implement @abc.abstractmethod" " 'download_album_cover'"
         )
 
+    async def download_album_cover_async(self, artalb: ArtAlb) -> Optional[bytes]:
+        """
+        Coroutine version of `download_album_cover`. Runs
+        `download_album_cover` in the event loop's default executor.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.download_album_cover, artalb
+        )
+
 
 class Discogs_Downloader_PAT(Discogs_Downloader):
     """
@@ -2184,6 +3086,27 @@ class Discogs_Downloader_PAT(Discogs_Downloader):
             return response2.content
         return None
 
+    @overrides(Discogs_Downloader)
+    async def download_album_cover_async(self, artalb: ArtAlb) -> Optional[bytes]:
+        self._log.debug("%s.download_album_cover_async(%s)", self.QNAME, artalb)
+        url = self._search_url_assemble(artalb)
+        self._log.info("HTTP Request '%s'", url)
+        response1 = await self._do_request_async(url, self._headers(self.pat_token))
+        if not response1.ok:
+            return None
+        cover_image_url = Discogs_Downloader.extract_cover_image(
+            response1.body.decode("utf-8", "replace"), self._log
+        )
+        if cover_image_url:
+            self._log.info("HTTP Request '%s'", cover_image_url)
+            response2 = await self._do_request_async(
+                cover_image_url, self._headers(self.pat_token)
+            )
+            if not response2.ok:
+                return None
+            return response2.body
+        return None
+
 
 # global thread lock for all `Discogs_Downloader_OAuth` instances
 # XXX: should this declaration be moved to within the class?
@@ -2624,417 +3547,2021 @@ class ImageSearcher_Discogs(ImageSearcher_Medium_Network):
 
         return True if self._image_bytes else False
 
+    @overrides(ImageSearcher)
+    async def go_async(self) -> Optional[Result]:
+        if not await self.search_album_image_async():
+            return None
+        return await self.write_album_image_async(self.image_path)
 
-def process_dir(
-    dirp: Path,
-    image_nt: str,
-    overwrite: bool,
-    result_queue: queue.SimpleQueue,
-    daa_list: DirArtAlb_List,
-) -> DirArtAlb_List:
+    async def search_album_image_async(self) -> bool:
+        """Coroutine version of `search_album_image`"""
+        if not self.artalb[0] or not self.artalb[1]:
+            return False
+
+        self._image_bytes = await self.discogs_downloader.download_album_cover_async(self.artalb)
+
+        return True if self._image_bytes else False
+
+
+class ScanIndexRecord(NamedTuple):
+    """A directory as recorded in the `ScanIndex`"""
+
+    subdirs: Tuple[str, ...]
+    """names of sub-directories"""
+    audio_files: Tuple[str, ...]
+    """names of audio media files"""
+    artalb: Optional[ArtAlb]
+    """`None` if not determined"""
+    image_nt: str
+    """image name and type checked for `image`"""
+    image: bool
+    """file `image_nt` exists"""
+    result_ok: Optional[bool]
+    """`bool` of the last `Result`, `None` if there was no `Result`"""
+    result_message: str
+    ignore_file: bool = False
+    """file `IGNORE_FILE_NAME` exists"""
+
+
+class ScanIndex(SqliteStore):
     """
-    Recursively process sub-directories of given directory,
-    gathering artist/album info per-directory.
+    Persistent index of directories read during the directory walk.
 
-    Call initially with empty daa_list. daa_list will be
-    gradually populated by recursive calls. Provide coverFiles
-    list to ignore directories where cover files already exist.
-
-    TODO: XXX: This function does too much!
-               This function should just return a list of directories that are
-               deemed to be Album directories.
-               Put that check into helper function
-                  e.g.
-                  `is_album_dir(dirp: Path) -> bool`
-               Let something outside of this attempt to determine
-               1. if the directory should be written to (check if image exists
-                  and overwrite)
-                  e.g.
-                  `dir_requires_cover(dirp: Path) -> bool`
-               2. deteremine the Artist and Album of that directory.
-                  e.g.
-                  `def deteremine_ArtAlb(dirp: Path) -> ArtAlb`
-
-    TODO: XXX: Implementing this recursively just makes this function weird.
-               Consider `os.walk` instead.
-
-    TODO: XXX: I really hate this function.
+    Each directory is recorded with its `st_dev`, `st_ino`, and `st_mtime_ns`.
+    Adding, removing, or renaming an entry within a directory changes the
+    directory `st_mtime_ns`. So while those are unchanged, the recorded
+    sub-directories, audio media files, `ArtAlb` and existence of the image
+    file may be used instead of reading the directory and the audio media
+    files within it.
 
-    :param dirp: directory path to process
-    :param image_nt: image name and type, e.g. "cover.jpg"
-    :param overwrite: --overwrite
-    :param result_queue: append Result about any found image files
-    :param daa_list: accumulated directories for later processing
-    :return accumulated directories for later processing
+    Changing the audio media file tags in-place does not change the directory
+    `st_mtime_ns`, use `refresh` to read all directories anew.
     """
-    log.debug('process_dir("%s", "%s", …)', dirp, image_nt)
 
-    dirs = []
-    files = []
+    QNAME = __qualname__
+    FILE_NAME = "scan-index.sqlite3"
+    SCHEMA_VERSION = 2
+    TABLES = ("dirs",)
+    SCHEMA = (
+        """\
+CREATE TABLE dirs (
+    path TEXT PRIMARY KEY,
+    dev INTEGER,
+    ino INTEGER,
+    mtime_ns INTEGER,
+    subdirs TEXT,
+    audio_files TEXT,
+    ignore_file INTEGER,
+    artist TEXT,
+    album TEXT,
+    image_nt TEXT,
+    image INTEGER,
+    result_ok INTEGER,
+    result_message TEXT,
+    result_time REAL
+)""",
+    )
+    RACY_NS = 2 * 1000000000
+    """
+    A directory modified this recently (nanoseconds) may be modified again
+    within the same `st_mtime_ns` tick. Do not trust the recorded entry for it.
+    """
 
-    if not dirp.exists():
-        log.error('path does not exist: "%s"', dirp)
-        return daa_list
-    if not dirp.is_dir():
-        log.error('path is not a directory: "%s"', dirp)
-        return daa_list
+    refresh: bool
+    hits: int
+    """count of directories found unchanged"""
+    misses: int
+    """count of directories not found or changed"""
+
+    def __init__(self, path: Path, refresh: bool = False):
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        super().__init__(path)
+
+    def get(self, dirp: Path, st: os.stat_result) -> Optional[ScanIndexRecord]:
+        """return the record of `dirp` if it is unchanged since recorded"""
+        rows = []
+        if not self.refresh:
+            rows = self._read(
+                "SELECT dev, ino, mtime_ns, subdirs, audio_files, artist, album, image_nt, image,"
+                " result_ok, result_message, ignore_file FROM dirs WHERE path = ?",
+                (str(dirp),),
+            )
+        if not rows or tuple(rows[0][0:3]) != (st.st_dev, st.st_ino, st.st_mtime_ns):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        (
+            _,
+            _,
+            _,
+            subdirs,
+            audio_files,
+            artist,
+            album,
+            image_nt,
+            image,
+            result_ok,
+            result_message,
+            ignore_file,
+        ) = rows[0]
+        artalb = None
+        if artist is not None and album is not None:
+            artalb = ArtAlb_new(artist, album)
+        return ScanIndexRecord(
+            tuple(json.loads(subdirs)),
+            tuple(json.loads(audio_files)),
+            artalb,
+            image_nt or "",
+            bool(image),
+            None if result_ok is None else bool(result_ok),
+            result_message or "",
+            bool(ignore_file),
+        )
 
-    # read dirp directory contents
-    try:
-        log.debug('%s: processing directory "%s"', func_name(), dirp)
-        for fp in dirp.iterdir():  # 'fp' is a file path
-            log.debug('%s: found "%s"', func_name(), fp)
-            if fp.is_dir():
-                dirs.append(fp)
-            elif fp.is_file():
-                files.append(fp)
-    except OSError as err:
-        log.exception(err)
-        return daa_list
+    def put_listing(
+        self,
+        dirp: Path,
+        st: os.stat_result,
+        subdirs: Sequence[str],
+        audio_files: Sequence[str],
+        ignore_file: bool = False,
+    ) -> None:
+        """
+        record the entries of directory `dirp` and whether file
+        `IGNORE_FILE_NAME` exists, forget the prior `ArtAlb`
+        """
+        mtime_ns = st.st_mtime_ns
+        if time.time_ns() - mtime_ns < self.RACY_NS:
+            mtime_ns = -1  # never matches
+        values = (
+            st.st_dev,
+            st.st_ino,
+            mtime_ns,
+            json.dumps(list(subdirs)),
+            json.dumps(list(audio_files)),
+            int(ignore_file),
+            str(dirp),
+        )
+        if not self._write(
+            "UPDATE dirs SET dev = ?, ino = ?, mtime_ns = ?, subdirs = ?, audio_files = ?,"
+            " ignore_file = ?, artist = NULL, album = NULL, image_nt = NULL, image = NULL"
+            " WHERE path = ?",
+            values,
+        ):
+            self._write(
+                "INSERT INTO dirs (dev, ino, mtime_ns, subdirs, audio_files, ignore_file, path)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
 
-    # recurse into subdirs
-    dirs.sort()
-    for dir_ in dirs:
-        # XXX: should not this append the return of process_dir?
-        daa_list = process_dir(dir_, image_nt, overwrite, result_queue, daa_list=daa_list)
+    def put_album(self, dirp: Path, artalb: Optional[ArtAlb], image_nt: str, image: bool) -> None:
+        """record the `ArtAlb` of directory `dirp` and whether file `image_nt` exists"""
+        self._write(
+            "UPDATE dirs SET artist = ?, album = ?, image_nt = ?, image = ? WHERE path = ?",
+            (
+                artalb[0] if artalb is not None else None,
+                artalb[1] if artalb is not None else None,
+                image_nt,
+                int(image),
+                str(dirp),
+            ),
+        )
 
-    # if there are no audio media files in this directory (search by suffix,
-    # e.g. '.mp3', '.flac', etc.) then (presume it's not a music album
-    # directory) so return
-    if not any(suffix in set([f.suffix.lower() for f in files]) for suffix in AUDIO_TYPES):
-        log.debug('no audio media files within directory "%s"', dirp)
-        return daa_list
-    log.debug('found audio media files within directory "%s"', dirp)
+    def put_result(self, result: Result) -> None:
+        """record the last `Result` for the directory of `result.image_path`"""
+        self._write(
+            "UPDATE dirs SET result_ok = ?, result_message = ?, result_time = ? WHERE path = ?",
+            (int(bool(result)), result.message, time.time(), str(result.image_path.parent)),
+        )
 
-    # if image file path already exists and not overwrite then return
-    image_path = dirp.joinpath(image_nt)
-    if image_path.exists():
-        if not overwrite:
-            log.info('cover file "%s" exists and no overwrite, skip directory "%s"', image_nt, dirp)
-            r_ = Result.SkipDueToNoOverwrite(
-                artalb=None,
-                imagesearcher=None,
-                image_path=image_path,
-                wropts=WrOpts(overwrite, False),
-            )
-            result_queue.put(r_)
-            return daa_list
-        else:
-            log.debug('cover file "%s" exists and passed --overwrite', image_nt)
 
-    # if dirp is already within daa_list then no further processing needed
-    if dirp in [d_[0] for d_ in daa_list]:
-        log.warning('directory "%s" already in daa_list', dirp)
-        return daa_list
+class TagCache(SqliteStore):
+    """
+    Persistent cache of the Artist and Album read from audio media file tags,
+    keyed on the file path, size, and `st_mtime_ns`. An unchanged audio
+    media file is not read again.
 
-    # TODO: it would be good to take the most common strings found for
-    #       artist and album among all media files found in the directory. It's
-    #       probably common that audio media files vary in their correctness,
-    #       e.g. some mp3 files may not have ID3 set, and some mp3 have the
-    #       wrong ID3 'album' value.
+    At most `max_entries` are kept, the least recently used entries are
+    evicted during `close`.
+    """
 
-    # TODO: related to prior TODO, Various Artists albums will have inconsistent
-    #       Artist tag but consistent Album tag.
+    QNAME = __qualname__
+    FILE_NAME = "tag-cache.sqlite3"
+    MAX_ENTRIES = 500000
+    SCHEMA_VERSION = 1
+    TABLES = ("tags",)
+    SCHEMA = (
+        """\
+CREATE TABLE tags (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    artist TEXT,
+    album TEXT,
+    used REAL
+)""",
+        "CREATE INDEX tags_used ON tags (used)",
+    )
+    RACY_NS = ScanIndex.RACY_NS
+    """a file modified this recently (nanoseconds) may still be written to"""
+
+    max_entries: int
+    hits: int
+    misses: int
+
+    def __init__(self, path: Path, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        super().__init__(path)
+
+    def get(self, fp: Path, st: os.stat_result) -> Optional[ArtAlb]:
+        """return the cached Artist and Album of unchanged file `fp`"""
+        rows = self._read(
+            "SELECT size, mtime_ns, artist, album FROM tags WHERE path = ?", (str(fp),)
+        )
+        if not rows or tuple(rows[0][0:2]) != (st.st_size, st.st_mtime_ns):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        self._write("UPDATE tags SET used = ? WHERE path = ?", (time.time(), str(fp)))
+        return ArtAlb_new(rows[0][2], rows[0][3])
+
+    def put(self, fp: Path, st: os.stat_result, artalb: ArtAlb) -> None:
+        """cache the Artist and Album of file `fp`"""
+        if time.time_ns() - st.st_mtime_ns < self.RACY_NS:
+            return
+        self._write(
+            "INSERT OR REPLACE INTO tags (path, size, mtime_ns, artist, album, used)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (str(fp), st.st_size, st.st_mtime_ns, artalb[0], artalb[1], time.time()),
+        )
 
-    files.sort()
-    for fp in files:  # file path
-        ext = fp.suffix.lower()
-        if ext not in AUDIO_TYPES:
-            continue
-        # try to get media tag info from file
-        artist = Artist("")
-        album = Album("")
-        try:
-            ar, al = get_artist_album[ext](fp)
-            # sometimes a long string of spaces is returned
-            ar = Artist(ar.strip())
-            al = Album(al.strip())
-            # Don't overwrite prior good values with new empty values.
-            # Also careful of special cases of 'Unknown Artist' (set for tag
-            # 'WM/AlbumArtist' in poorly maintained .wma files)
-            if not artist and ar and ar != Artist("Unknown Artist"):
-                artist = Artist(ar)
-            if not album and al and al != Album("Unknown Album"):
-                album = Album(al)
-        except Exception as err:
-            log.error(
-                'Exception: (%s) while processing file "%s"'
-                % (
-                    err,
-                    fp,
-                )
+    def evict(self) -> int:
+        """remove least recently used entries beyond `max_entries`, return count removed"""
+        with self._lock:
+            count = self._read("SELECT COUNT(*) FROM tags")[0][0]
+            if count <= self.max_entries:
+                return 0
+            log.debug("%s: evicting %d entries", self.QNAME, count - self.max_entries)
+            self._write(
+                "DELETE FROM tags WHERE path IN (SELECT path FROM tags ORDER BY used LIMIT ?)",
+                (count - self.max_entries,),
             )
-            continue
-        # if artist and album found, append to daa_list and return
-        if artist and album:
-            log.info('Album details found: %s within file "%s"', str_AA(artist, album), fp)
-            daa = DirArtAlb((dirp, ArtAlb_new(artist, album)))
-
-            # XXX: development self-check
-            if daa in daa_list:
-                log.warning('DAA "%s" already in daa_list1', daa)
-
-            daa_list.append(daa)
-            return daa_list
-
-    # no Artist /Album data found within media files, guess the Artist • Album
-    # based on directory name. Try several re patterns to match the directory
-    # name
-    # tuple of (re pattern, artist match group index, album match group index)
-    # TODO: move this name matching subsection into an easily testable function
-    artist = Artist("")
-    album = Album("")
-    bname = dirp.name
-    for patt in [
-        # Artist -- Year -- Album
-        (r"""([\w\W]+) -- ([12][\d]{3}) -- ([\w\W]+)""", 0, 2),
-        # Artist • Year • Album
-        (r"""([\w\W]+) • ([12][\d]{3}) • ([\w\W]+)""", 0, 2),
-        # Artist - Year - Album
-        (r"""([\w\W]+) [\-] ([12][\d]{3}) [\-] ([\w\W]+)""", 0, 2),
-        # Artist -- Album
-        (r"""([\w\W]+) -- ([\w\W]+)""", 0, 1),
-        # Artist • Album
-        (r"""([\w\W]+) • ([\w\W]+)""", 0, 1),
-        # Artist - Album
-        (r"""([\w\W]+) - ([\w\W]+)""", 0, 1),
-    ]:
-        try:
-            fm = re.fullmatch(patt[0], bname)
-            if fm:
-                ar = Artist(fm.groups()[patt[1]])
-                al = Album(fm.groups()[patt[2]])
-                if not artist:
-                    artist = Artist(ar)
-                if not album:
-                    album = Album(al)
-            if artist and album:
-                log.info(
-                    "Album details found: %s derived from " 'directory name "%s"',
-                    str_AA(artist, album),
-                    bname,
-                )
-                daa = DirArtAlb((dirp, ArtAlb_new(artist, album)))
-
-                # XXX: development self-check
-                if daa in daa_list:
-                    log.warning('DAA "%s" already in daa_list2', daa)
+            return count - self.max_entries
+
+    @overrides(SqliteStore)
+    def close(self) -> None:
+        self.evict()
+        super().close()
+
+
+# tuple of (re pattern, artist match group index, album match group index)
+# for guessing the Artist • Album based on the directory name
+DIR_NAME_PATTERNS = (
+    # Artist -- Year -- Album
+    (re.compile(r"""([\w\W]+) -- ([12][\d]{3}) -- ([\w\W]+)"""), 0, 2),
+    # Artist • Year • Album
+    (re.compile(r"""([\w\W]+) • ([12][\d]{3}) • ([\w\W]+)"""), 0, 2),
+    # Artist - Year - Album
+    (re.compile(r"""([\w\W]+) [\-] ([12][\d]{3}) [\-] ([\w\W]+)"""), 0, 2),
+    # Artist -- Album
+    (re.compile(r"""([\w\W]+) -- ([\w\W]+)"""), 0, 1),
+    # Artist • Album
+    (re.compile(r"""([\w\W]+) • ([\w\W]+)"""), 0, 1),
+    # Artist - Album
+    (re.compile(r"""([\w\W]+) - ([\w\W]+)"""), 0, 1),
+)
 
-                daa_list.append(daa)
-                return daa_list
-        # XXX: this except is too broad
-        except:
-            pass
 
-    log.debug("no Artist or Album found or derived or no suitable media files" ' within "%s"', dirp)
+def read_artist_album(fp: Path) -> Optional[ArtAlb]:
+    """
+    Read the Artist and Album media tags of audio media file `fp`.
 
-    # XXX: This special case must be handled in implementations of
-    #      `search_album_image`. It is used in
+    :return: Artist and Album, or `None` if there was an error
+    """
+    try:
+        return get_artist_album[fp.suffix.lower()](fp)
+    except Exception as err:
+        log.error(
+            'Exception: (%s) while processing file "%s"'
+            % (
+                err,
+                fp,
+            )
+        )
+        return None
+
+
+def artalb_clean(artalb: ArtAlb) -> ArtAlb:
+    """strip `artalb` and remove known placeholder values"""
+    # sometimes a long string of spaces is returned
+    ar = Artist(artalb[0].strip())
+    al = Album(artalb[1].strip())
+    # careful of special cases of 'Unknown Artist' (set for tag
+    # 'WM/AlbumArtist' in poorly maintained .wma files)
+    if ar == Artist("Unknown Artist"):
+        ar = Artist("")
+    if al == Album("Unknown Album"):
+        al = Album("")
+    return ArtAlb_new(ar, al)
+
+
+def read_artist_album_files(audio_files: Sequence[Path]) -> List[Tuple[Path, Optional[ArtAlb]]]:
+    """
+    Read the media tags of `audio_files`, in order, until both Artist and
+    Album are found.
+
+    :return: each file read and its `read_artist_album`
+    """
+    tags: List[Tuple[Path, Optional[ArtAlb]]] = []
+    for fp in audio_files:
+        artalb = read_artist_album(fp)
+        tags.append((fp, artalb))
+        if artalb is not None and all(artalb_clean(artalb)):
+            break
+    return tags
+
+
+def read_artist_album_chunk(
+    chunk: Sequence[Sequence[Path]],
+) -> List[List[Tuple[Path, Optional[ArtAlb]]]]:
+    """`read_artist_album_files` for each in `chunk`, run by `TagPool` processes"""
+    return [read_artist_album_files(audio_files) for audio_files in chunk]
+
+
+def artalb_from_files(audio_files: Sequence[Path], tagcache: Optional[TagCache] = None) -> ArtAlb:
+    """
+    Read the media tags of `audio_files`, in order, until both Artist and
+    Album are found.
+
+    :param audio_files: audio media files, file name extension must be one of
+                        `AUDIO_TYPES`
+    :param tagcache: use the cached tags of unchanged files, cache the tags
+                     of other files
+    :return: found Artist and Album, or `ArtAlb_empty`
+    """
+    # TODO: it would be good to take the most common strings found for
+    #       artist and album among all media files found in the directory. It's
+    #       probably common that audio media files vary in their correctness,
+    #       e.g. some mp3 files may not have ID3 set, and some mp3 have the
+    #       wrong ID3 'album' value.
+
+    # TODO: related to prior TODO, Various Artists albums will have inconsistent
+    #       Artist tag but consistent Album tag.
+
+    for fp in audio_files:  # file path
+        # try to get media tag info from file
+        if tagcache is not None:
+            try:
+                st = fp.stat()
+            except OSError as err:
+                log.error('Exception: (%s) while processing file "%s"' % (err, fp))
+                continue
+            artalb = tagcache.get(fp, st)
+            if artalb is None:
+                artalb = read_artist_album(fp)
+                if artalb is not None:
+                    tagcache.put(fp, st, artalb)
+        else:
+            artalb = read_artist_album(fp)
+        if artalb is None:
+            continue
+        artalb = artalb_clean(artalb)
+        if artalb[0] and artalb[1]:
+            log.info('Album details found: %s within file "%s"', str_ArtAlb(artalb), fp)
+            return artalb
+
+    return ArtAlb_empty
+
+
+class TagPool:
+    """
+    Read audio media file tags in a pool of processes. Reading tags with
+    mutagen is pure-Python and CPU-bound, threads reading tags are serialized
+    by the GIL.
+
+    Album directories are sent to the processes in chunks of `chunksize` to
+    amortise the inter-process communication. Files found unchanged in the
+    `TagCache` are not sent, tags read by the processes are put in the
+    `TagCache`.
+
+    Submitted album directories are returned by `ready` in the order
+    submitted.
+    """
+
+    QNAME = __qualname__
+
+    Job = Tuple[Path, List[Path], Callable[[ArtAlb], DirArtAlb]]
+
+    processes: int
+    chunksize: int
+    tagcache: Optional[TagCache]
+
+    def __init__(self, processes: int, chunksize: int, tagcache: Optional[TagCache] = None):
+        self.processes = processes
+        self.chunksize = chunksize
+        self.tagcache = tagcache
+        # "spawn" because forking while the directory walk threads run may
+        # copy a held lock into a process
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._lock = threading.RLock()
+        # (directory, audio media files, finish) not yet sent
+        self._chunk: List[TagPool.Job] = []
+        # chunks sent
+        self._pending: Deque[Tuple[concurrent.futures.Future, List[TagPool.Job]]] = (
+            collections.deque()
+        )
+        self._done: List[DirArtAlb] = []
+
+    def submit(
+        self, dirp: Path, audio_files: List[Path], finish: Callable[[ArtAlb], DirArtAlb]
+    ) -> None:
+        """
+        Read the Artist and Album of `audio_files`, like `artalb_from_files`,
+        then pass it to `finish`. The `DirArtAlb` returned by `finish` is
+        later returned by `ready`.
+        """
+        artalb = self._from_cache(audio_files)
+        with self._lock:
+            if artalb is not None:
+                self._done.append(finish(artalb))
+                return
+            self._chunk.append((dirp, audio_files, finish))
+            if len(self._chunk) >= self.chunksize:
+                self._flush()
+
+    def ready(self, wait: bool = False) -> List[DirArtAlb]:
+        """
+        return the `DirArtAlb` of submitted album directories that are done.
+        If `wait` then wait for all submitted album directories to be done.
+
+        Also waits if too many chunks are pending, i.e. the caller is
+        submitting faster than the processes read.
+        """
+        with self._lock:
+            if wait:
+                self._flush()
+            while self._pending and (
+                wait or self._pending[0][0].done() or len(self._pending) > self.processes * 2
+            ):
+                future, chunk = self._pending.popleft()
+                for (dirp, _, finish), tags in zip(chunk, future.result()):
+                    self._done.append(finish(self._from_tags(tags)))
+            done = self._done
+            self._done = []
+        return done
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def _flush(self) -> None:
+        if not self._chunk:
+            return
+        log.debug("%s: submit chunk of %d album directories", self.QNAME, len(self._chunk))
+        future = self._executor.submit(
+            read_artist_album_chunk, [audio_files for _, audio_files, _ in self._chunk]
+        )
+        self._pending.append((future, self._chunk))
+        self._chunk = []
+
+    def _from_cache(self, audio_files: Sequence[Path]) -> Optional[ArtAlb]:
+        """Artist and Album of `audio_files` if all needed files are in the `TagCache`"""
+        if self.tagcache is None:
+            return None
+        for fp in audio_files:
+            try:
+                st = fp.stat()
+            except OSError:
+                return None
+            artalb = self.tagcache.get(fp, st)
+            if artalb is None:
+                return None
+            artalb = artalb_clean(artalb)
+            if artalb[0] and artalb[1]:
+                return artalb
+        return ArtAlb_empty
+
+    def _from_tags(self, tags: List[Tuple[Path, Optional[ArtAlb]]]) -> ArtAlb:
+        """Artist and Album from `read_artist_album_files`"""
+        for fp, artalb in tags:
+            if artalb is None:
+                continue
+            if self.tagcache is not None:
+                try:
+                    self.tagcache.put(fp, fp.stat(), artalb)
+                except OSError as err:
+                    log.debug(err)
+            artalb = artalb_clean(artalb)
+            if artalb[0] and artalb[1]:
+                log.info('Album details found: %s within file "%s"', str_ArtAlb(artalb), fp)
+                return artalb
+        return ArtAlb_empty
+
+
+def artalb_from_dir_name(dirp: Path) -> ArtAlb:
+    """
+    Guess the Artist • Album based on directory name. Try several re patterns
+    to match the directory name.
+
+    :return: guessed Artist and Album, or `ArtAlb_empty`
+    """
+    bname = dirp.name
+    for patt, ar_index, al_index in DIR_NAME_PATTERNS:
+        fm = patt.fullmatch(bname)
+        if not fm:
+            continue
+        artist = Artist(fm.groups()[ar_index])
+        album = Album(fm.groups()[al_index])
+        if artist and album:
+            log.info(
+                "Album details found: %s derived from " 'directory name "%s"',
+                str_AA(artist, album),
+                bname,
+            )
+            return ArtAlb_new(artist, album)
+
+    return ArtAlb_empty
+
+
+def process_album_dir(
+    dirp: Path,
+    audio_files: List[Path],
+    image_nt: str,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    dirs_seen: Set[Path],
+    index: Optional[ScanIndex] = None,
+    record: Optional[ScanIndexRecord] = None,
+    tagcache: Optional[TagCache] = None,
+    tagpool: Optional[TagPool] = None,
+) -> Optional[DirArtAlb]:
+    """
+    Given directory `dirp` and the audio media files within it, determine
+    if `dirp` needs an album cover image and determine the Artist and Album.
+
+    :param dirp: directory path
+    :param audio_files: audio media files within `dirp`
+    :param image_nt: image name and type, e.g. "cover.jpg"
+    :param overwrite: --overwrite
+    :param result_queue: append Result about any found image files
+    :param dirs_seen: directories already processed, `dirp` is added
+    :param index: record the determined Artist and Album
+    :param record: `dirp` as recorded in `index`, if unchanged then the
+                   recorded Artist and Album are used
+    :param tagcache: passed to `artalb_from_files`
+    :param tagpool: submit the reading of `audio_files` to `tagpool`, the
+                    `DirArtAlb` is later returned by `tagpool.ready`
+    :return: `DirArtAlb` for later processing or `None` if there is nothing to
+             do for `dirp` or it was submitted to `tagpool`
+    """
+    # if there are no audio media files in this directory (search by suffix,
+    # e.g. '.mp3', '.flac', etc.) then (presume it's not a music album
+    # directory) so return
+    if not audio_files:
+        log.debug('no audio media files within directory "%s"', dirp)
+        return None
+    log.debug('found audio media files within directory "%s"', dirp)
+
+    # if image file path already exists and not overwrite then return
+    image_path = dirp.joinpath(image_nt)
+    if record is not None and record.image_nt == image_nt:
+        image_exists = record.image
+    else:
+        record = None
+        image_exists = image_path.exists()
+    if image_exists:
+        if not overwrite:
+            if index is not None and record is None:
+                index.put_album(dirp, None, image_nt, image_exists)
+            log.info('cover file "%s" exists and no overwrite, skip directory "%s"', image_nt, dirp)
+            r_ = Result.SkipDueToNoOverwrite(
+                artalb=None,
+                imagesearcher=None,
+                image_path=image_path,
+                wropts=WrOpts(overwrite, False),
+            )
+            result_queue.put(r_)
+            return None
+        else:
+            log.debug('cover file "%s" exists and passed --overwrite', image_nt)
+
+    # if dirp was already processed then no further processing needed
+    if dirp in dirs_seen:
+        log.warning('directory "%s" already processed', dirp)
+        return None
+    dirs_seen.add(dirp)
+
+    if record is not None and record.artalb is not None:
+        return album_dir_artalb(dirp, record.artalb)
+
+    def finish(artalb: ArtAlb) -> DirArtAlb:
+        if not ArtAlb_is(artalb):
+            # no Artist /Album data found within media files
+            artalb = artalb_from_dir_name(dirp)
+        if index is not None:
+            index.put_album(dirp, artalb, image_nt, image_exists)
+        return album_dir_artalb(dirp, artalb)
+
+    audio_files.sort()
+    if tagpool is not None:
+        tagpool.submit(dirp, audio_files, finish)
+        return None
+    return finish(artalb_from_files(audio_files, tagcache))
+
+
+def album_dir_artalb(dirp: Path, artalb: ArtAlb) -> DirArtAlb:
+    """the `DirArtAlb` of album directory `dirp`"""
+    if not ArtAlb_is(artalb):
+        log.debug(
+            "no Artist or Album found or derived or no suitable media files" ' within "%s"', dirp
+        )
+
+    # XXX: An empty ArtAlb is a special case that must be handled in
+    #      implementations of `search_album_image`. It is used in
     #      `ImageSearcher_LikelyCover.search_album_image`.
     #      Not ideal.
     #      See Issue #7
-    daa = DirArtAlb((dirp, ArtAlb_empty))
+    return DirArtAlb((dirp, artalb))
+
+
+class IgnoreRule(NamedTuple):
+    """A gitignore-style pattern, see `ignore_rules_parse`"""
+
+    regex: Pattern
+    negate: bool
+    """pattern began with "!", a match is not ignored"""
+    dir_only: bool
+    """pattern ended with "/", only matches directories"""
+    base: Optional[Path]
+    """match the path relative to `base`, `None` means match the name"""
+
+
+IgnoreRules = Tuple[IgnoreRule, ...]
+
+
+def _ignore_pattern_re(pattern: str) -> Pattern:
+    """translate a gitignore-style `pattern` to a compiled regular expression"""
+    re_ = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            re_ += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            re_ += ".*"
+            i += 2
+            continue
+        if c == "*":
+            re_ += "[^/]*"
+        elif c == "?":
+            re_ += "[^/]"
+        elif c == "[" and "]" in pattern[i + 1 :]:
+            j = pattern.index("]", i + 1)
+            class_ = pattern[i + 1 : j]
+            if class_.startswith("!"):
+                class_ = "^" + class_[1:]
+            re_ += "[" + class_.replace("\\", "\\\\") + "]"
+            i = j
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            re_ += re.escape(pattern[i])
+        else:
+            re_ += re.escape(c)
+        i += 1
+    return re.compile(re_ + r"\Z", re.DOTALL)
+
+
+def ignore_rules_parse(lines: Iterable[str], base: Path) -> IgnoreRules:
+    """
+    Parse gitignore-style patterns, one per line. Blank lines and lines
+    beginning with "#" are skipped.
+
+    * a pattern without "/" matches the name of a file or directory at any
+      depth below `base`, e.g. "@eaDir", "*.m3u"
+    * a pattern with "/" matches the path relative to `base`,
+      e.g. "Podcasts/", "/.snapshot", "**/Scans"
+    * a pattern ending with "/" only matches directories
+    * a pattern beginning with "!" un-ignores a prior match
+    * "*" and "?" do not match "/", "**" does
+    """
+    rules: List[IgnoreRule] = []
+    for line in lines:
+        pattern = line.rstrip("\r\n")
+        if not pattern.strip() or pattern.startswith("#"):
+            continue
+        pattern = pattern.rstrip()
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            continue
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        rules.append(
+            IgnoreRule(_ignore_pattern_re(pattern), negate, dir_only, base if anchored else None)
+        )
+    return tuple(rules)
+
+
+def ignore_rules_read(dirp: Path) -> IgnoreRules:
+    """parse the `IGNORE_FILE_NAME` file within `dirp`, if any"""
+    try:
+        with open(dirp.joinpath(IGNORE_FILE_NAME), encoding="utf-8", errors="replace") as f_:
+            rules = ignore_rules_parse(f_, dirp)
+    except OSError:
+        return ()
+    log.debug('read %d patterns from "%s"', len(rules), dirp.joinpath(IGNORE_FILE_NAME))
+    return rules
+
+
+def ignored(rules: IgnoreRules, path: Path, is_dir: bool) -> bool:
+    """is `path` ignored by `rules`? The last matching rule decides."""
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base is None:
+            subject = path.name
+        else:
+            try:
+                subject = path.relative_to(rule.base).as_posix()
+            except ValueError:
+                continue
+        if rule.regex.match(subject):
+            return not rule.negate
+    return False
+
+
+def ignore_rules_path(
+    root: Path, dirp: Path, rules: IgnoreRules, read: bool = True
+) -> Optional[IgnoreRules]:
+    """
+    The rules in effect for the entries of `dirp`, a sub-directory of
+    `root`, given `rules` in effect for the entries of `root`.
+    If `read` then the `IGNORE_FILE_NAME` files of `root` and the
+    sub-directories between `root` and `dirp` are read.
+
+    :return: rules, or `None` if `dirp` or a directory between `root` and
+             `dirp` is ignored
+    """
+    current = root
+    for part in dirp.relative_to(root).parts:
+        if read:
+            rules = rules + ignore_rules_read(current)
+        current = current.joinpath(part)
+        if ignored(rules, current, True):
+            return None
+    return rules
+
+
+def scan_dir(
+    dirp: Path,
+    visited: Set[Tuple[int, int]],
+    visited_lock: Any = contextlib.nullcontext(),
+    dir_stat: Optional[os.stat_result] = None,
+    index: Optional[ScanIndex] = None,
+    rules: IgnoreRules = (),
+) -> Optional[
+    Tuple[List[Tuple[Path, os.stat_result]], List[Path], Optional[ScanIndexRecord], IgnoreRules]
+]:
+    """
+    Read the entries of directory `dirp` using `os.scandir` which caches the
+    entry type so plain files and directories require no extra `stat` calls.
+
+    :param dirp: directory path to read
+    :param visited: (st_dev, st_ino) of directories already found. Found
+                    sub-directories are added. A sub-directory already in
+                    `visited` (e.g. a symbolic link loop) is not returned.
+    :param visited_lock: held while checking and updating `visited`
+    :param dir_stat: `stat` of `dirp`, required to use `index`
+    :param index: if `dirp` is unchanged since recorded in `index` then use
+                  the recorded entries instead of reading `dirp`. Otherwise
+                  record the entries read.
+    :param rules: `IgnoreRule`s in effect for `dirp`. Ignored
+                  sub-directories and audio media files are not returned, so
+                  ignored sub-directories are never read.
+    :return: ([(sub-directory, stat)], audio media files, index record,
+             rules in effect for the sub-directories) within `dirp`,
+             or `None` if `dirp` could not be read
+    """
+
+    def visit(st: os.stat_result, path: str) -> bool:
+        key = (st.st_dev, st.st_ino)
+        with visited_lock:
+            if key in visited:
+                log.warning('directory "%s" already walked, skip', path)
+                return False
+            visited.add(key)
+        return True
+
+    subdirs: List[Tuple[Path, os.stat_result]] = []
+    audio_files: List[Path] = []
+
+    record = None
+    if index is not None and dir_stat is not None:
+        record = index.get(dirp, dir_stat)
+    if record is not None:
+        log.debug('unchanged directory "%s"', dirp)
+        # creating or removing the ignore file changes the directory
+        # `st_mtime_ns`, so only read it if recorded
+        if record.ignore_file:
+            rules = rules + ignore_rules_read(dirp)
+        for name in record.subdirs:
+            subdir = dirp.joinpath(name)
+            if rules and ignored(rules, subdir, True):
+                log.debug('ignored directory "%s"', subdir)
+                continue
+            try:
+                st = subdir.stat()
+            except OSError as err:
+                log.debug(err)
+                continue
+            if visit(st, str(subdir)):
+                subdirs.append((subdir, st))
+        audio_files = [
+            dirp.joinpath(name)
+            for name in record.audio_files
+            if not (rules and ignored(rules, dirp.joinpath(name), False))
+        ]
+        return subdirs, audio_files, record, rules
+
+    log.debug('processing directory "%s"', dirp)
+    subdir_entries: List[os.DirEntry] = []
+    ignore_file = False
+    try:
+        with os.scandir(dirp) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdir_entries.append(entry)
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in AUDIO_TYPES_SET
+                        and entry.is_file()
+                    ):
+                        audio_files.append(Path(entry.path))
+                    elif entry.name == IGNORE_FILE_NAME:
+                        ignore_file = True
+                except OSError as err:
+                    log.debug(err)
+    except OSError as err:
+        log.exception(err)
+        return None
+
+    if index is not None and dir_stat is not None:
+        index.put_listing(
+            dirp,
+            dir_stat,
+            [e_.name for e_ in subdir_entries],
+            [af.name for af in audio_files],
+            ignore_file,
+        )
+
+    if ignore_file:
+        rules = rules + ignore_rules_read(dirp)
+    for entry in subdir_entries:
+        subdir = Path(entry.path)
+        if rules and ignored(rules, subdir, True):
+            log.debug('ignored directory "%s"', subdir)
+            continue
+        try:
+            st = entry.stat()
+        except OSError as err:
+            log.debug(err)
+            continue
+        if visit(st, entry.path):
+            subdirs.append((subdir, st))
+    if rules:
+        audio_files = [af for af in audio_files if not ignored(rules, af, False)]
+
+    return subdirs, audio_files, None, rules
+
+
+def walk_rules(
+    dirs: Sequence[Path], dirp: Path, walkopts: WalkOpts, read: bool = True
+) -> Optional[IgnoreRules]:
+    """
+    The `IgnoreRule`s in effect for the entries of `dirp`, a sub-directory of
+    one of `dirs`, as if `dirp` were found during the walk of `dirs`.
+    See `ignore_rules_path`.
+
+    :return: rules, or `None` if `dirp` is not walked because it is ignored,
+             deeper than `walkopts.max_depth`, or not within `dirs`
+    """
+    root = walk_root(dirs, dirp)
+    if root is None:
+        return None
+    if walkopts.max_depth is not None and len(dirp.relative_to(root).parts) > walkopts.max_depth:
+        return None
+    return ignore_rules_path(root, dirp, ignore_rules_parse(walkopts.excludes, root), read)
+
+
+def walk_root(dirs: Sequence[Path], dirp: Path) -> Optional[Path]:
+    """the one of `dirs` that is `dirp` or contains `dirp`"""
+    for root in dirs:
+        root = Path(root)
+        if dirp == root or root in dirp.parents:
+            return root
+    return None
+
+
+def _dir_root_stat(dirp: Path) -> Optional[os.stat_result]:
+    """
+    `stat` of a directory passed by the user. Log an error and return `None`
+    if it is not a directory.
+    """
+    try:
+        st = dirp.stat()
+    except OSError:
+        log.error('path does not exist: "%s"', dirp)
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        log.error('path is not a directory: "%s"', dirp)
+        return None
+    return st
+
+
+def process_dir_iter(
+    dirp: Path,
+    image_nt: str,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    dirs_seen: Set[Path],
+    walkstats: Optional[WalkStats] = None,
+    index: Optional[ScanIndex] = None,
+    recurse: bool = True,
+    tagcache: Optional[TagCache] = None,
+    tagpool: Optional[TagPool] = None,
+    rules: IgnoreRules = (),
+    max_depth: Optional[int] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[DirArtAlb]:
+    """
+    Walk the given directory and its sub-directories, gathering artist/album
+    info per-directory.
+
+    The walk is iterative, using an explicit stack, so there is no limit to the
+    depth of the directory tree. Symbolic links to directories are followed
+    once; a directory already walked (same `st_dev` and `st_ino`) is not
+    walked again.
+
+    Each `DirArtAlb` is yielded as soon as it is determined so the caller may
+    hand it off for further processing while the directory walk continues.
+    Sub-directories are walked in sorted order and a directory is yielded
+    after its sub-directories.
+
+    :param dirp: directory path to process
+    :param image_nt: image name and type, e.g. "cover.jpg"
+    :param overwrite: --overwrite
+    :param result_queue: append Result about any found image files
+    :param dirs_seen: directories already yielded, updated with each yielded
+                      directory
+    :param walkstats: updated for each directory read
+    :param index: directories unchanged since recorded in `index` are not
+                  read again, see `ScanIndex`
+    :param recurse: if `False` then only process `dirp`, not its
+                    sub-directories
+    :param tagcache: audio media files unchanged since cached in `tagcache`
+                     are not read again, see `TagCache`
+    :param tagpool: read audio media files in `tagpool` processes, these
+                    directories are yielded as the reads are done
+    :param rules: `IgnoreRule`s in effect for `dirp`, ignored sub-directories
+                  are not walked. `IGNORE_FILE_NAME` files found during the
+                  walk add rules.
+    :param max_depth: do not walk sub-directories deeper than this below
+                      `dirp`, `None` means no limit
+    :param shard: only process album directories in `shard`, see `shard_dir`
+    :return iterator of directories for later processing
+    """
+    log.debug('process_dir_iter("%s", "%s", …)', dirp, image_nt)
+
+    st = _dir_root_stat(dirp)
+    if st is None:
+        return
+
+    # (st_dev, st_ino) of every directory pushed onto the stack
+    visited: Set[Tuple[int, int]] = {(st.st_dev, st.st_ino)}
+    # stack of (directory, directory stat, audio media files within directory,
+    # index record of directory, depth of directory, rules of directory).
+    # audio media files is `None` if the directory has not yet been read
+    stack: List[
+        Tuple[
+            Path,
+            os.stat_result,
+            Optional[List[Path]],
+            Optional[ScanIndexRecord],
+            int,
+            IgnoreRules,
+        ]
+    ] = [(dirp, st, None, None, 0, rules)]
+    while stack:
+        dirp_, st_, audio_files, record, depth, rules_ = stack.pop()
+        if audio_files is not None:
+            # the sub-directories of dirp_ are done
+            if shard is not None and shard.by == "album" and audio_files:
+                audio_files = shard_dir(shard, dirp, dirp_, audio_files)
+            daa = process_album_dir(
+                dirp_,
+                audio_files,
+                image_nt,
+                overwrite,
+                result_queue,
+                dirs_seen,
+                index,
+                record,
+                tagcache,
+                tagpool,
+            )
+            if walkstats is not None:
+                walkstats.dir_done(daa is not None)
+            if daa is not None:
+                yield daa
+            if tagpool is not None:
+                yield from tagpool_ready(tagpool, walkstats)
+            continue
+
+        scan = scan_dir(dirp_, visited, dir_stat=st_, index=index, rules=rules_)
+        if scan is None:
+            continue
+        subdirs, audio_files, record, rules_ = scan
+        if shard is not None and shard.by == "top" and depth == 0:
+            subdirs = [sd for sd in subdirs if shard.mine(dirp, sd[0])]
+            if audio_files:
+                audio_files = shard_dir(shard, dirp, dirp_, audio_files)
+        stack.append((dirp_, st_, audio_files, record, depth, rules_))
+        if not recurse or (max_depth is not None and depth >= max_depth):
+            continue
+        # push in reverse so sub-directories are popped in sorted order
+        subdirs.sort(reverse=True)
+        stack.extend((subdir, sst, None, None, depth + 1, rules_) for subdir, sst in subdirs)
+
+    if tagpool is not None:
+        yield from tagpool_ready(tagpool, walkstats, wait=True)
+
+
+def process_dir_iter_parallel(
+    dirp: Path,
+    image_nt: str,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    dirs_seen: Set[Path],
+    threads: int,
+    walkstats: Optional[WalkStats] = None,
+    index: Optional[ScanIndex] = None,
+    tagcache: Optional[TagCache] = None,
+    tagpool: Optional[TagPool] = None,
+    rules: IgnoreRules = (),
+    max_depth: Optional[int] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[DirArtAlb]:
+    """
+    Walk the given directory and its sub-directories using `threads` threads,
+    gathering artist/album info per-directory.
+
+    Helpful for high-latency filesystems (e.g. NFS) where every directory read
+    and file read is a network round-trip; many directory reads are in
+    flight at once.
+
+    Each thread takes a directory from a shared queue of directories to read,
+    reads it, and puts the sub-directories back onto the shared queue. So
+    any idle thread takes the next directory as soon as one is found. The
+    shared queue is last-in first-out so the walk proceeds depth-first which
+    keeps the queue small and finds album directories sooner.
+
+    Each `DirArtAlb` is yielded as soon as it is determined, in no particular
+    order. See `process_dirs` for a sorted list.
+
+    See `process_dir_iter` for remaining parameters.
+
+    :param threads: count of threads walking directories
+    """
+    log.debug('process_dir_iter_parallel("%s", "%s", …, threads=%d)', dirp, image_nt, threads)
+
+    st = _dir_root_stat(dirp)
+    if st is None:
+        return
+
+    visited: Set[Tuple[int, int]] = {(st.st_dev, st.st_ino)}
+    visited_lock = threading.Lock()
+    # (directory, stat, depth, rules) to read, `None` tells a walking thread
+    # to return
+    work_queue: queue.LifoQueue = queue.LifoQueue()
+    # found `DirArtAlb`, `None` means the walk is done. bounded so walking
+    # threads wait on the consumer of this generator.
+    daa_queue: queue.Queue = queue.Queue(maxsize=threads * 4)
+    # count of directories queued but not yet done
+    pending = 1
+    pending_lock = threading.Lock()
+
+    def walk() -> None:
+        nonlocal pending
+        while True:
+            work = work_queue.get()
+            if work is None:
+                return
+            dirp_, st_, depth, rules_ = work
+            daa = None
+            try:
+                scan = scan_dir(dirp_, visited, visited_lock, st_, index, rules_)
+                if scan is not None:
+                    subdirs, audio_files, record, rules_ = scan
+                    if max_depth is not None and depth >= max_depth:
+                        subdirs = []
+                    if shard is not None:
+                        if shard.by == "top" and depth == 0:
+                            subdirs = [sd for sd in subdirs if shard.mine(dirp, sd[0])]
+                        if audio_files and (shard.by == "album" or depth == 0):
+                            audio_files = shard_dir(shard, dirp, dirp_, audio_files)
+                    with pending_lock:
+                        pending += len(subdirs)
+                    for subdir, sst in subdirs:
+                        work_queue.put((subdir, sst, depth + 1, rules_))
+                    # a directory is read at most once per walk (see `visited`)
+                    # so `dirs_seen` is not checked and updated concurrently
+                    # for the same directory
+                    daa = process_album_dir(
+                        dirp_,
+                        audio_files,
+                        image_nt,
+                        overwrite,
+                        result_queue,
+                        dirs_seen,
+                        index,
+                        record,
+                        tagcache,
+                        tagpool,
+                    )
+                    if walkstats is not None:
+                        walkstats.dir_done(daa is not None)
+                    if daa is not None:
+                        daa_queue.put(daa)
+            except Exception as ex:
+                log.exception(ex)
+            with pending_lock:
+                pending -= 1
+                done = pending == 0
+            if done:
+                for _ in range(threads):
+                    work_queue.put(None)
+                daa_queue.put(None)
+
+    work_queue.put((dirp, st, 0, rules))
+    for tc_ in range(threads):
+        th = threading.Thread(target=walk, name="walk-%d" % (tc_ + 1))
+        # daemon: don't wait on threads if the consumer stops early
+        th.daemon = True
+        th.start()
+
+    while True:
+        if tagpool is None:
+            daa = daa_queue.get()
+        else:
+            try:
+                daa = daa_queue.get(timeout=0.1)
+            except queue.Empty:
+                yield from tagpool_ready(tagpool, walkstats)
+                continue
+        if daa is None:
+            break
+        yield daa
+
+    if tagpool is not None:
+        yield from tagpool_ready(tagpool, walkstats, wait=True)
+
+
+def shard_dir(shard: Shard, root: Path, dirp: Path, audio_files: List[Path]) -> List[Path]:
+    """
+    `audio_files` of album directory `dirp` within `root` if `dirp` is in
+    `shard`, otherwise no audio files so `dirp` is not an album directory.
+    """
+    if shard.mine(root, dirp):
+        return audio_files
+    log.debug('directory "%s" is not in shard %d/%d', dirp, shard.index + 1, shard.count)
+    return []
+
+
+def tagpool_ready(
+    tagpool: TagPool, walkstats: Optional[WalkStats], wait: bool = False
+) -> List[DirArtAlb]:
+    """`tagpool.ready`, counted in `walkstats`"""
+    daa_list = tagpool.ready(wait)
+    if walkstats is not None:
+        walkstats.albums_found(len(daa_list))
+    return daa_list
+
+
+def process_dir(
+    dirp: Path,
+    image_nt: str,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    daa_list: DirArtAlb_List,
+) -> DirArtAlb_List:
+    """
+    Recursively process sub-directories of given directory,
+    gathering artist/album info per-directory.
+
+    Call initially with empty daa_list. daa_list will be populated with the
+    directories yielded by `process_dir_iter`.
+
+    :param dirp: directory path to process
+    :param image_nt: image name and type, e.g. "cover.jpg"
+    :param overwrite: --overwrite
+    :param result_queue: append Result about any found image files
+    :param daa_list: accumulated directories for later processing
+    :return accumulated directories for later processing
+    """
+    log.debug('process_dir("%s", "%s", …)', dirp, image_nt)
+
+    dirs_seen: Set[Path] = set(d_[0] for d_ in daa_list)
+    for daa in process_dir_iter(dirp, image_nt, overwrite, result_queue, dirs_seen):
+        daa_list.append(daa)
+
+    return daa_list
+
+
+def process_dirs_iter(
+    dirs: List[Path],
+    image_name: str,
+    image_type: ImageType,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    walkopts: WalkOpts = WalkOpts(),
+    walkstats: Optional[WalkStats] = None,
+) -> Iterator[DirArtAlb]:
+    """
+    Yield each directory where Album • Artist info can be derived as soon as
+    it is found. Each directory is yielded once.
+
+    This allows the "album cover search" tasks to be handed off to the task
+    queue while the "album directory search phase" is still running.
+    """
+    log.debug("process_dirs_iter()")
+
+    image_nt = image_name + os.extsep + image_type.value
+    dirs_seen: Set[Path] = set()
+    for dir_ in dirs:
+        log.debug('process_dirs_iter loop "%s"', dir_)
+        d_ = Path(dir_)
+        rules = ignore_rules_parse(walkopts.excludes, d_)
+        if walkopts.threads > 1:
+            yield from process_dir_iter_parallel(
+                d_,
+                image_nt,
+                overwrite,
+                result_queue,
+                dirs_seen,
+                walkopts.threads,
+                walkstats,
+                walkopts.index,
+                walkopts.tagcache,
+                walkopts.tagpool,
+                rules,
+                walkopts.max_depth,
+                walkopts.shard,
+            )
+        else:
+            yield from process_dir_iter(
+                d_,
+                image_nt,
+                overwrite,
+                result_queue,
+                dirs_seen,
+                walkstats,
+                walkopts.index,
+                tagcache=walkopts.tagcache,
+                tagpool=walkopts.tagpool,
+                rules=rules,
+                max_depth=walkopts.max_depth,
+                shard=walkopts.shard,
+            )
+    if walkstats is not None:
+        walkstats.stop()
+        log.info("%s", walkstats)
+
+
+def process_dirs(
+    dirs: List[Path],
+    image_name: str,
+    image_type: ImageType,
+    overwrite: bool,
+    result_queue: queue.SimpleQueue,
+    walkopts: WalkOpts = WalkOpts(),
+    walkstats: Optional[WalkStats] = None,
+) -> DirArtAlb_List:
+    """
+    Gather sorted list of directories where Album • Artist info can be derived.
+
+    This waits for the entire "album directory search phase" to complete.
+    See `process_dirs_iter` for handing off each directory as soon as it is
+    found.
+    """
+    log.debug("process_dirs()")
+
+    daa_list: DirArtAlb_List = list(
+        process_dirs_iter(dirs, image_name, image_type, overwrite, result_queue, walkopts, walkstats)
+    )
+    log.debug("directories to process:\n\t%s", pformat(daa_list))
+    # sort, the order of `process_dir_iter_parallel` varies
+    daa_list.sort()
+
+    return daa_list
+
+
+class DirWatcher(abc.ABC):
+    """
+    Watch directory trees for changes relevant to finding album directories,
+    i.e. added or removed audio media files and added sub-directories.
+    Changes to other files, like a written album cover image file, are
+    ignored.
+    """
+
+    QNAME = __qualname__
+
+    dirs: List[Path]
+    exclude: Callable[[Path], bool]
+    """directories for which `exclude` returns `True` are not watched"""
+
+    def __init__(self, dirs: Sequence[Path], exclude: Optional[Callable[[Path], bool]] = None):
+        self.dirs = [Path(d_) for d_ in dirs]
+        self.exclude = exclude or (lambda dirp: False)
+
+    @abc.abstractmethod
+    def poll(self, timeout: float) -> Set[Path]:
+        """
+        wait up to `timeout` seconds for changes.
+        return directories changed, may be empty.
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def _subdirs(self, dirp: Path) -> List[Path]:
+        """sub-directories of `dirp` and `dirp`, walked iteratively"""
+        dirs: List[Path] = []
+        visited: Set[Tuple[int, int]] = set()
+        stack = [dirp]
+        while stack:
+            dirp_ = stack.pop()
+            try:
+                st = dirp_.stat()
+            except OSError as err:
+                log.debug(err)
+                continue
+            if (st.st_dev, st.st_ino) in visited or not stat.S_ISDIR(st.st_mode):
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            if self.exclude(dirp_):
+                continue
+            dirs.append(dirp_)
+            try:
+                with os.scandir(dirp_) as entries:
+                    stack.extend(Path(e_.path) for e_ in entries if e_.is_dir())
+            except OSError as err:
+                log.debug(err)
+        return dirs
+
+
+class DirWatcher_Inotify(DirWatcher):
+    """
+    Watch directory trees using Linux inotify. A watch is added for every
+    directory so this is subject to `/proc/sys/fs/inotify/max_user_watches`.
+
+    Does not see changes made by other hosts to network filesystems,
+    e.g. NFS, use `DirWatcher_Poll` for those.
+    """
+
+    QNAME = __qualname__
+
+    # from <sys/inotify.h>
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+    EVENT = struct.Struct("iIII")
+    """struct inotify_event, followed by `len` bytes of name"""
+
+    _fd: int
+    _wds: Dict[int, Path]
+    """watch descriptor to directory"""
+
+    def __init__(self, dirs: Sequence[Path], exclude: Optional[Callable[[Path], bool]] = None):
+        super().__init__(dirs, exclude)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._inotify_add_watch = libc.inotify_add_watch
+        self._inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._inotify_add_watch.restype = ctypes.c_int
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            errno_ = ctypes.get_errno()
+            raise OSError(errno_, os.strerror(errno_))
+        self._fd = fd
+        self._wds = {}
+        for dirp in self.dirs:
+            self._watch_tree(dirp)
+
+    def _watch_tree(self, dirp: Path) -> List[Path]:
+        """add watches for `dirp` and its sub-directories, return those directories"""
+        dirs = self._subdirs(dirp)
+        for dirp_ in dirs:
+            wd = self._inotify_add_watch(self._fd, os.fsencode(dirp_), self.MASK)
+            if wd < 0:
+                errno_ = ctypes.get_errno()
+                log.warning('%s: cannot watch "%s": %s', self.QNAME, dirp_, os.strerror(errno_))
+                continue
+            self._wds[wd] = dirp_
+        log.debug('%s: watching %d directories under "%s"', self.QNAME, len(dirs), dirp)
+        return dirs
+
+    @overrides(DirWatcher)
+    def poll(self, timeout: float) -> Set[Path]:
+        changed: Set[Path] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        data = b""
+        while True:
+            try:
+                data += os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, _, len_ = self.EVENT.unpack_from(data, offset)
+            name = os.fsdecode(
+                data[offset + self.EVENT.size : offset + self.EVENT.size + len_].rstrip(b"\0")
+            )
+            offset += self.EVENT.size + len_
+            if mask & self.IN_Q_OVERFLOW:
+                log.warning("%s: event queue overflow, all directories changed", self.QNAME)
+                changed.update(self._wds.values())
+                continue
+            dirp = self._wds.get(wd)
+            if dirp is None:
+                continue
+            if mask & self.IN_IGNORED:
+                # directory removed
+                del self._wds[wd]
+                continue
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    changed.update(self._watch_tree(dirp.joinpath(name)))
+                continue
+            if os.path.splitext(name)[1].lower() in AUDIO_TYPES_SET:
+                changed.add(dirp)
+        return changed
+
+    @overrides(DirWatcher)
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class DirWatcher_Poll(DirWatcher):
+    """
+    Watch directory trees by polling every `interval` seconds. Each poll
+    `stat`s every directory, only directories with a changed modification
+    time are read.
+    """
+
+    QNAME = __qualname__
+
+    interval: float
+    _next: float
+    _snapshot: Dict[Path, Tuple[int, FrozenSet[str]]]
+    """directory to (modification time, names of audio media files and sub-directories)"""
+
+    def __init__(
+        self,
+        dirs: Sequence[Path],
+        interval: float = WATCH_POLL_INTERVAL,
+        exclude: Optional[Callable[[Path], bool]] = None,
+    ):
+        super().__init__(dirs, exclude)
+        self.interval = interval
+        self._snapshot = {}
+        self._scan()
+        self._next = time.monotonic() + interval
+
+    @staticmethod
+    def _names(dirp: Path) -> FrozenSet[str]:
+        try:
+            with os.scandir(dirp) as entries:
+                return frozenset(
+                    e_.name
+                    for e_ in entries
+                    if e_.is_dir() or os.path.splitext(e_.name)[1].lower() in AUDIO_TYPES_SET
+                )
+        except OSError as err:
+            log.debug(err)
+            return frozenset()
+
+    def _scan(self) -> Set[Path]:
+        """update the snapshot, return directories changed since the prior snapshot"""
+        changed: Set[Path] = set()
+        snapshot: Dict[Path, Tuple[int, FrozenSet[str]]] = {}
+        for root in self.dirs:
+            for dirp in self._subdirs(root):
+                try:
+                    mtime_ns = dirp.stat().st_mtime_ns
+                except OSError as err:
+                    log.debug(err)
+                    continue
+                prior = self._snapshot.get(dirp)
+                if prior is not None and prior[0] == mtime_ns:
+                    snapshot[dirp] = prior
+                    continue
+                names = self._names(dirp)
+                snapshot[dirp] = (mtime_ns, names)
+                if self._snapshot and (prior is None or prior[1] != names):
+                    changed.add(dirp)
+        self._snapshot = snapshot
+        return changed
+
+    @overrides(DirWatcher)
+    def poll(self, timeout: float) -> Set[Path]:
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next = time.monotonic() + self.interval
+        return self._scan()
+
+
+def DirWatcher_new(
+    dirs: Sequence[Path], poll: float = 0.0, exclude: Optional[Callable[[Path], bool]] = None
+) -> DirWatcher:
+    """
+    return a `DirWatcher_Inotify` if possible and `poll` is `0`, otherwise a
+    `DirWatcher_Poll`
+    """
+    if not poll:
+        try:
+            return DirWatcher_Inotify(dirs, exclude)
+        except (OSError, AttributeError) as err:
+            log.warning("inotify is not available (%s), polling for changes", err)
+            poll = WATCH_POLL_INTERVAL
+    return DirWatcher_Poll(dirs, poll, exclude)
+
+
+def watch_dirs(
+    watcher: DirWatcher,
+    settle: float,
+    on_settled: Callable[[List[Path]], None],
+    stop: threading.Event,
+    idle: float = 1.0,
+) -> None:
+    """
+    Pass changed directories of `watcher` to `on_settled` after they have been
+    unchanged for `settle` seconds, i.e. debounce the burst of changes
+    during the copying or ripping of an album. Return when `stop` is set.
+
+    `on_settled` is also called with an empty list about every `idle`
+    seconds.
+    """
+    # changed directory to time of the latest change
+    pending: Dict[Path, float] = {}
+    while not stop.is_set():
+        timeout = idle
+        if pending:
+            timeout = min(idle, max(0.0, min(pending.values()) + settle - time.monotonic()))
+        changed = watcher.poll(timeout)
+        now = time.monotonic()
+        for dirp in changed:
+            log.debug('watch: changed "%s"', dirp)
+            pending[dirp] = now
+        settled = sorted(d_ for d_, t_ in pending.items() if now - t_ >= settle)
+        for dirp in settled:
+            del pending[dirp]
+        on_settled(settled)
+
+
+def searchers_new(
+    artalb: ArtAlb,
+    image_type: ImageType,
+    image_path: Path,
+    searches,
+    googlecse_opts: GoogleCSE_Opts,
+    discogs_args: Discogs_Args,
+    referer: str,
+    wropts: WrOpts,
+    loglevel: int,
+) -> List[ImageSearcher]:
+    """
+    Return the ImageSearchers for the `searches` requested, in order of
+    searching.
+    """
+    # TODO: Have order of user requested searchers matter (i.e. note order of
+    #       command-line arguments passed). Search in order of passed script
+    #       options.
+
+    search_likely, search_embedded, search_musicbrainz, search_discogs, search_googlecse = searches
+
+    searchers: List[ImageSearcher] = []
+    if search_likely:
+        searchers.append(
+            ImageSearcher_LikelyCover(artalb, image_type, image_path, wropts, loglevel)
+        )
+    if search_embedded:
+        searchers.append(
+            ImageSearcher_EmbeddedMedia(artalb, image_type, image_path, wropts, loglevel)
+        )
+    if search_musicbrainz:
+        searchers.append(
+            ImageSearcher_MusicBrainz(artalb, image_type, image_path, wropts, loglevel)
+        )
+    if search_discogs:
+        searchers.append(
+            ImageSearcher_Discogs(artalb, image_type, image_path, discogs_args, wropts, loglevel)
+        )
+    if search_googlecse:
+        searchers.append(
+            ImageSearcher_GoogleCSE(
+                artalb, image_type, image_path, googlecse_opts, referer, wropts, loglevel
+            )
+        )
+    return searchers
+
+
+def searcher_go(is_: ImageSearcher) -> Optional[Result]:
+    """
+    Run one ImageSearcher. Return the Result if an image was found (or some
+    other final Result), else None.
+    """
+    try:
+        res = is_.go()
+    except Exception as ex:
+        log.exception(ex)
+        return None
+    if not res:
+        log.debug("  %s did not find an album cover image", is_.QNAME)
+        return None
+    return res
+
+
+def task_searchers(task: tuple) -> Tuple[ArtAlb, Path, List[ImageSearcher]]:
+    """
+    Unpack a task as queued by `main`, return the Artist and Album, the image
+    path, and the ImageSearchers of the task.
+    """
+    (
+        daa,
+        image_type,
+        image_name,
+        searches,
+        googlecse_opts,
+        discogs_args,
+        referer,
+        wropts,
+        loglevel,
+    ) = task
+    pathd, artalb = daa
+    image_path = Path(pathd, image_name + image_type.suffix)
+    searchers = searchers_new(
+        artalb,
+        image_type,
+        image_path,
+        searches,
+        googlecse_opts,
+        discogs_args,
+        referer,
+        wropts,
+        loglevel,
+    )
+    return artalb, image_path, searchers
+
+
+async def searcher_go_async(is_: ImageSearcher) -> Optional[Result]:
+    """Coroutine version of `searcher_go`"""
+    try:
+        res = await is_.go_async()
+    except Exception as ex:
+        log.exception(ex)
+        return None
+    if not res:
+        log.debug("  %s did not find an album cover image", is_.QNAME)
+        return None
+    return res
+
+
+class SearchEngine(abc.ABC):
+    """
+    Base class for running the ImageSearchers of tasks. Each task's Result is
+    put to the `result_queue`.
+    """
+
+    QNAME: str = __qualname__
+
+    def __init__(
+        self,
+        result_queue: queue.SimpleQueue,
+        journal: Optional[Journal] = None,
+        shutdown: Optional[threading.Event] = None,
+        pending_max: int = SEARCH_PENDING_MAX,
+    ):
+        """
+        :param result_queue: each task's Result is put here
+        :param journal: journal each result
+        :param shutdown: if set then tasks not yet started are skipped, tasks
+                         in progress are done
+        :param pending_max: `submit` blocks while this many tasks are in
+                            progress (backpressure on the directory walk)
+        """
+        self.result_queue = result_queue
+        self.journal = journal
+        self.shutdown = shutdown
+        self._pending_slots = threading.BoundedSemaphore(pending_max)
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self._cancelled = threading.Event()
+        # count of steps run per SearcherMedium
+        self.steps: Dict[SearcherMedium, int] = {sm_: 0 for sm_ in SearcherMedium}
+
+    def submit(self, task: tuple) -> None:
+        """
+        Begin the task. Blocks while `pending_max` tasks are in progress.
+
+        :param task: a task as queued by `main`, see `task_searchers`
+        """
+        artalb, image_path, searchers = task_searchers(task)
+        wropts = task[7]
+        log.debug("☐ task: %s", str_ArtAlb(artalb))
+        self.submit_searchers(
+            searchers, Result.NoSuitableImageFound(artalb, image_path, wropts)
+        )
+
+    def submit_searchers(self, searchers: List[ImageSearcher], result: Result) -> None:
+        """
+        Begin running `searchers` in turn until one finds an image. Blocks
+        while `pending_max` tasks are in progress.
+
+        :param searchers: ImageSearchers, in order of searching
+        :param result: the Result if no ImageSearcher finds an image
+        """
+        self._pending_slots.acquire()
+        with self._pending_cond:
+            self._pending += 1
+        if self._shutdown_set():
+            self._done(None)
+            return
+        self._start(searchers, result)
+
+    @abc.abstractmethod
+    def _start(self, searchers: List[ImageSearcher], result: Result) -> None:
+        """begin the task, call `_done` when done"""
+        raise NotImplementedError("child class failed to implement abstractmethod")
+
+    def _step_count(self, is_: ImageSearcher) -> None:
+        with self._pending_cond:
+            self.steps[is_.search_medium()] += 1
+
+    def _shutdown_set(self) -> bool:
+        return self.shutdown is not None and self.shutdown.is_set()
+
+    def _done(self, result: Optional[Result]) -> None:
+        """the task is done, `result` is None if the task was skipped"""
+        try:
+            if result is not None:
+                log.debug("☑ task_done %s", str_ArtAlb(result.artalb))
+                self.result_queue.put(result)
+                if self.journal is not None:
+                    self.journal.append(result)
+        except Exception as ex:
+            log.exception(ex)
+        finally:
+            with self._pending_cond:
+                self._pending -= 1
+                self._pending_cond.notify_all()
+            self._pending_slots.release()
+
+    @property
+    def pending(self) -> int:
+        """count of tasks in progress"""
+        return self._pending
 
-    # XXX: development self-check
-    if daa in daa_list:
-        log.warning('DAA "%s" already in daa_list3', daa)
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all tasks in progress to be done. Return False if `timeout`
+        passed first.
+        """
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: self._pending == 0, timeout)
 
-    daa_list.append(daa)
-    return daa_list
+    @abc.abstractmethod
+    def close(self) -> None:
+        """wait for all tasks in progress then stop"""
+        raise NotImplementedError("child class failed to implement abstractmethod")
 
+    def cancel(self) -> None:
+        """
+        Stop now. Steps not yet started are dropped, steps in progress are not
+        continued. Tasks dropped are never done, so do not `join` after this.
+        """
+        self._cancelled.set()
+
+    @staticmethod
+    def _executor_cancel(executor: concurrent.futures.ThreadPoolExecutor) -> None:
+        """stop `executor` without waiting, drop its queued work"""
+        if sys.version_info >= (3, 9):
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            executor.shutdown(wait=False)
 
-def process_dirs(
-    dirs: List[Path],
-    image_name: str,
-    image_type: ImageType,
-    overwrite: bool,
-    result_queue: queue.SimpleQueue,
-) -> DirArtAlb_List:
-    """
-    Gather list of directories where Album • Artist info can be derived.
 
-    XXX: `process_dirs` and `process_dir` are inefficient. The "album cover search"
-         tasks are not immediately handed off to the global task queues. Instead,
-         this entire "album directory search phase" done within `process_dirs` must
-         entirely complete before further processing. If this program was to be made
-         faster, then this would be a good place ot start; handing off processing
-         task to the global task queue for each "album directory" found as soon as
-         possible.
+class SearchPools(SearchEngine):
+    """
+    An executor for each SearcherMedium: a few threads for DISK work and many
+    threads for NETWORK work.
+
+    A task is done as a chain of steps, one step per ImageSearcher. Each step
+    is submitted to the executor of its ImageSearcher's SearcherMedium. When a
+    step does not find an image then the next step is submitted as a
+    continuation. So an album moves from `ImageSearcher_LikelyCover` on a disk
+    thread to `ImageSearcher_MusicBrainz` on a network thread, and no thread
+    is held for the whole task. A thread waiting on a slow network request
+    does not hold up disk work, and the reverse.
     """
-    log.debug("process_dirs()")
 
-    daa_list: DirArtAlb_List = []
-    for dir_ in dirs:
-        log.debug('process_dirs loop "%s"', dir_)
-        d_ = Path(dir_)
-        image_nt = image_name + os.extsep + image_type.value
-        daal = process_dir(d_, image_nt, overwrite, result_queue, daa_list=[])
-        if daal:
-            daa_list += daal
+    QNAME: str = __qualname__
+
+    def __init__(
+        self,
+        result_queue: queue.SimpleQueue,
+        journal: Optional[Journal] = None,
+        shutdown: Optional[threading.Event] = None,
+        disk_threads: int = SEMAPHORE_COUNT_DISK,
+        network_threads: int = SEMAPHORE_COUNT_NETWORK,
+        pending_max: int = SEARCH_PENDING_MAX,
+    ):
+        """
+        :param disk_threads: thread count of the DISK executor
+        :param network_threads: thread count of the NETWORK executor
+        """
+        super().__init__(result_queue, journal, shutdown, pending_max)
+        self._executors: Dict[SearcherMedium, concurrent.futures.ThreadPoolExecutor] = {
+            SearcherMedium.DISK: concurrent.futures.ThreadPoolExecutor(
+                max_workers=disk_threads, thread_name_prefix="disk"
+            ),
+            SearcherMedium.NETWORK: concurrent.futures.ThreadPoolExecutor(
+                max_workers=network_threads, thread_name_prefix="network"
+            ),
+        }
 
-    # remove duplicates
-    daa_list_: DirArtAlb_List = list(set(daa for daa in daa_list))
-    log.debug("directories to process:\n\t%s", pformat(daa_list_))
-    # sort
-    daa_list_.sort()
+    @overrides(SearchEngine)
+    def _start(self, searchers: List[ImageSearcher], result: Result) -> None:
+        self._step(searchers, 0, result)
+
+    def _step(self, searchers: List[ImageSearcher], index: int, result: Result) -> None:
+        """submit the ImageSearcher at `index` to the executor of its medium"""
+        if self._cancelled.is_set():
+            return
+        if index >= len(searchers):
+            self._done(result)
+            return
+        is_ = searchers[index]
+        try:
+            executor = self._executors[is_.search_medium()]
+            executor.submit(self._go, searchers, index, result)
+        except Exception as ex:
+            log.exception(ex)
+            self._done(result)
 
-    return daa_list_
+    def _go(self, searchers: List[ImageSearcher], index: int, result: Result) -> None:
+        """run the ImageSearcher at `index`, then continue with the next"""
+        if self._cancelled.is_set():
+            return
+        if index == 0 and self._shutdown_set():
+            self._done(None)
+            return
+        is_ = searchers[index]
+        self._step_count(is_)
+        res = searcher_go(is_)
+        if res:
+            self._done(res)
+            return
+        self._step(searchers, index + 1, result)
 
+    @overrides(SearchEngine)
+    def close(self) -> None:
+        self.join()
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
 
-disk_semaphore = threading.Semaphore(value=SEMAPHORE_COUNT_DISK)
-network_semaphore = threading.Semaphore(value=SEMAPHORE_COUNT_NETWORK)
+    @overrides(SearchEngine)
+    def cancel(self) -> None:
+        super().cancel()
+        for executor in self._executors.values():
+            self._executor_cancel(executor)
 
 
-def search_create_image(
-    artalb: ArtAlb,
-    image_type: ImageType,
-    image_path: Path,
-    searches,
-    googlecse_opts: GoogleCSE_Opts,
-    discogs_args: Discogs_Args,
-    referer: str,
-    wropts: WrOpts,
-    loglevel: int,
-) -> Result:
+class SearchLoop(SearchEngine):
     """
-    Do the download using ImageSearchers given the needed data. Write image
-    file data to `image_path`.
-    Return count of bytes of image data written to file.
+    Run network ImageSearchers as coroutines on one asyncio event loop, in a
+    thread of its own. Each task is a coroutine that runs its ImageSearchers in
+    turn. Network ImageSearchers await `ImageSearcher.go_async`, so hundreds of
+    tasks may wait on network responses at once, each needing only a coroutine
+    and a socket. Disk ImageSearchers are run in a thread executor.
     """
-    log.debug("  search_create_image(%s, …)", str_ArtAlb(artalb))
 
-    # TODO: Have order of user requested searchers matter (i.e. note order of
-    #       command-line arguments passed). Search in order of passed script
-    #       options.
-
-    search_likely, search_embedded, search_musicbrainz, search_discogs, search_googlecse = searches
+    QNAME: str = __qualname__
 
-    searchers = []
-    if search_likely:
-        searchers.append(
-            ImageSearcher_LikelyCover(artalb, image_type, image_path, wropts, loglevel)
-        )
-    if search_embedded:
-        searchers.append(
-            ImageSearcher_EmbeddedMedia(artalb, image_type, image_path, wropts, loglevel)
-        )
-    if search_musicbrainz:
-        searchers.append(
-            ImageSearcher_MusicBrainz(artalb, image_type, image_path, wropts, loglevel)
-        )
-    if search_discogs:
-        searchers.append(
-            ImageSearcher_Discogs(artalb, image_type, image_path, discogs_args, wropts, loglevel)
+    def __init__(
+        self,
+        result_queue: queue.SimpleQueue,
+        journal: Optional[Journal] = None,
+        shutdown: Optional[threading.Event] = None,
+        disk_threads: int = SEMAPHORE_COUNT_DISK,
+        concurrency: int = SearchOpts().concurrency,
+    ):
+        """
+        :param disk_threads: thread count of the DISK executor
+        :param concurrency: count of tasks in progress at once
+        """
+        super().__init__(result_queue, journal, shutdown, concurrency)
+        self._disk = concurrent.futures.ThreadPoolExecutor(
+            max_workers=disk_threads, thread_name_prefix="disk"
         )
-    if search_googlecse:
-        searchers.append(
-            ImageSearcher_GoogleCSE(
-                artalb, image_type, image_path, googlecse_opts, referer, wropts, loglevel
-            )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=self.QNAME, daemon=True
         )
+        self._thread.start()
 
-    global disk_semaphore, network_semaphore
+    @overrides(SearchEngine)
+    def _start(self, searchers: List[ImageSearcher], result: Result) -> None:
+        asyncio.run_coroutine_threadsafe(self._run(searchers, result), self._loop)
 
-    # fallback result
-    result = Result.NoSuitableImageFound(artalb, image_path, wropts)
-    log.debug("  searching for %s", str_ArtAlb(artalb))
-    for is_ in searchers:
-        semaphore = None
+    async def _run(self, searchers: List[ImageSearcher], result: Result) -> None:
+        """run `searchers` in turn until one finds an image"""
+        result_: Optional[Result] = result
         try:
-            if is_.search_medium() is SearcherMedium.DISK:
-                semaphore = disk_semaphore
-            elif is_.search_medium() is SearcherMedium.NETWORK:
-                semaphore = network_semaphore
-            else:
-                raise ValueError("Unknown SearcherMedium %s" % is_.search_medium())
-            semaphore.acquire()
-
-            res = is_.go()
-            if not res:
-                log.debug("  %s did not find an album cover image", is_.QNAME)
-                continue
-            result = res
-            break
+            if self._shutdown_set():
+                result_ = None
+                return
+            for is_ in searchers:
+                if self._cancelled.is_set():
+                    break
+                self._step_count(is_)
+                if is_.search_medium() is SearcherMedium.DISK:
+                    res = await self._loop.run_in_executor(self._disk, searcher_go, is_)
+                else:
+                    res = await searcher_go_async(is_)
+                if res:
+                    result_ = res
+                    break
         except Exception as ex:
             log.exception(ex)
         finally:
-            if semaphore:
-                semaphore.release()
-
-    return result
+            # a cancelled task is not done, e.g. not journaled
+            self._done(None if self._cancelled.is_set() else result_)
 
+    @overrides(SearchEngine)
+    def close(self) -> None:
+        self.join()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._disk.shutdown(wait=True)
 
-def process_tasks(task_queue: queue.Queue, result_queue: queue.SimpleQueue) -> None:
-    """
-    Thread entry point.
-    While things to process in task_queue then do so. This function will
-    exit when task_queue.get raises Empty.
-
-    TODO: it should be a speed improvement to differentiate between tasks that
-          are more suited for parallel work (e.g. network requests) and those
-          suited for sequential work (e.g. local disk reads). Currently, the
-          task divvying does not distinguish.
-
-    :param task_queue: queue of tasks (images to search for)
-    :param result_queue: queue of attempts at downloads/copies, used for later
-                        printing of program results
-    :return: None
-    """
-    log.debug("→")
+    @overrides(SearchEngine)
+    def cancel(self) -> None:
+        super().cancel()
+        self._executor_cancel(self._disk)
 
-    while True:
-        try:
-            # don't block (use `get_nowait`) because the task_queue
-            # is assumed to have been filled with tasks by now. It's only being
-            # consumed at this point in the program.
-            (
-                daa,
-                image_type,
-                image_name,
-                (
-                    search_likely,
-                    search_embedded,
-                    search_musicbrainz,
-                    search_discogs,
-                    search_googlecse,
-                ),
-                googlecse_opts,
-                discogs_args,
-                referer,
-                wropts,
-                loglevel,
-            ) = task_queue.get_nowait()
-        except queue.Empty:  # catch Empty and return gracefully
-            log.debug("←")
-            return
-        pathd, artalb = daa
-        image_nt = image_name + image_type.suffix
-        image_path = Path(pathd, image_nt)
-        log.debug("☐ task: %s", str_ArtAlb(artalb))
-        try:
-            result = search_create_image(
-                artalb,
-                image_type,
-                image_path,
-                (
-                    search_likely,
-                    search_embedded,
-                    search_musicbrainz,
-                    search_discogs,
-                    search_googlecse,
-                ),
-                googlecse_opts,
-                discogs_args,
-                referer,
-                wropts,
-                loglevel,
-            )
-            result_queue.put(result)
-        except Exception as ex:
-            log.exception(ex)
 
-        log.debug("☑ task_done %s", str_ArtAlb(artalb))
-        task_queue.task_done()
+def SearchEngine_new(
+    searchopts: SearchOpts,
+    result_queue: queue.SimpleQueue,
+    journal: Optional[Journal] = None,
+    shutdown: Optional[threading.Event] = None,
+) -> SearchEngine:
+    """return the SearchEngine of `searchopts.engine`"""
+    if searchopts.engine == "asyncio":
+        return SearchLoop(result_queue, journal, shutdown, concurrency=searchopts.concurrency)
+    return SearchPools(result_queue, journal, shutdown)
 
 
 def parse_args_opts(
@@ -3055,6 +5582,10 @@ def parse_args_opts(
     str,
     WrOpts,
     int,
+    WalkOpts,
+    WatchOpts,
+    JournalOpts,
+    SearchOpts,
 ]:
     """parse command line arguments and options"""
 
@@ -3248,6 +5779,235 @@ Audio files supported are %s.""" % ", ".join(
         help="Discogs authentication Personal Access Token.",
     )
 
+    argg = parser.add_argument_group("Search engine")
+    argg.add_argument(
+        "--engine",
+        dest="engine",
+        action="store",
+        choices=SearchOpts.ENGINES,
+        default=SearchOpts().engine,
+        help='How searches are run. "threads" runs searches in a pool of'
+        ' threads for local disk searches and a pool of %d threads for network'
+        ' searches. "asyncio" runs network searches on one asyncio event loop,'
+        " allowing many more network searches at once."
+        " (default: %%(default)s)" % SEMAPHORE_COUNT_NETWORK,
+    )
+    argg.add_argument(
+        "--engine-concurrency",
+        dest="engine_concurrency",
+        action="store",
+        type=int,
+        default=SearchOpts().concurrency,
+        metavar="N",
+        help='For --engine asyncio, search for N album directories at once.'
+        " (default: %(default)s)",
+    )
+
+    argg = parser.add_argument_group("Directory walk")
+    argg.add_argument(
+        "--walk-threads",
+        dest="walk_threads",
+        action="store",
+        type=int,
+        default=1,
+        help="count of threads reading directories and audio media files"
+        " during the search for album directories. More threads help on"
+        " high-latency filesystems, e.g. NFS. The directory walk rate is"
+        " printed so this may be tuned for a particular filesystem."
+        " (default: %(default)s)",
+    )
+    argg.add_argument(
+        "--scan-index",
+        dest="scan_index",
+        action="store_true",
+        default=False,
+        help="Keep a persistent index of directories walked. Directories"
+        " unchanged since the prior run (same modification time) are not"
+        " read again, nor are their audio media files. The index is stored"
+        " in the user cache directory.",
+    )
+    argg.add_argument(
+        "--scan-index-file",
+        dest="scan_index_file",
+        action="store",
+        default=None,
+        help="Keep the persistent index of directories walked in this file."
+        " Implies --scan-index.",
+    )
+    argg.add_argument(
+        "--scan-index-refresh",
+        dest="scan_index_refresh",
+        action="store_true",
+        default=False,
+        help="Read all directories and audio media files anew and update the"
+        " index. Useful after changing audio media file tags. Implies"
+        " --scan-index.",
+    )
+    argg.add_argument(
+        "--tag-cache",
+        dest="tag_cache",
+        action="store_true",
+        default=False,
+        help="Keep a persistent cache of the Artist and Album read from audio"
+        " media files. Unchanged audio media files (same path, size, and"
+        " modification time) are not read again. The cache is stored in the"
+        " user cache directory.",
+    )
+    argg.add_argument(
+        "--tag-cache-file",
+        dest="tag_cache_file",
+        action="store",
+        default=None,
+        help="Keep the persistent cache of audio media file tags in this file."
+        " Implies --tag-cache.",
+    )
+    argg.add_argument(
+        "--tag-cache-max",
+        dest="tag_cache_max",
+        action="store",
+        type=int,
+        default=TagCache.MAX_ENTRIES,
+        metavar="ENTRIES",
+        help="Keep at most ENTRIES audio media files in the tag cache, the least"
+        " recently used are removed. (default: %(default)s)",
+    )
+    argg.add_argument(
+        "--tag-processes",
+        dest="tag_processes",
+        action="store",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Read audio media files in N processes. Reading audio media file"
+        " tags is CPU-bound, use this to read tags on all CPU cores."
+        " 0 reads tags in the directory walk threads. (default: %(default)s)",
+    )
+    argg.add_argument(
+        "--tag-chunksize",
+        dest="tag_chunksize",
+        action="store",
+        type=int,
+        default=WalkOpts().tag_chunksize,
+        metavar="ALBUMS",
+        help="Send album directories to the --tag-processes in chunks of this"
+        " many album directories. Larger chunks have less overhead, smaller"
+        " chunks spread better among processes. (default: %(default)s)",
+    )
+
+    argg.add_argument(
+        "-x",
+        "--exclude",
+        dest="excludes",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Do not walk sub-directories, nor read audio media files, matching"
+        " the gitignore-style PATTERN. A PATTERN without \"/\" matches a name at"
+        " any depth, e.g. \"@eaDir\", a PATTERN with \"/\" matches a path"
+        " relative to each of DIRS, e.g. \"/.snapshot\" or \"**/Scans/\"."
+        " May be passed more than once. Patterns are also read from any"
+        ' "%s" file found during the directory walk,'
+        " applied to that directory and its sub-directories." % IGNORE_FILE_NAME,
+    )
+    argg.add_argument(
+        "--max-depth",
+        dest="max_depth",
+        action="store",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Do not walk sub-directories more than N levels below each of"
+        " DIRS. 0 walks only DIRS. (default: no limit)",
+    )
+
+    argg.add_argument(
+        "--shard",
+        dest="shard",
+        action="store",
+        default=None,
+        metavar="I/N",
+        help="Only process shard I of N shards of the album directories, e.g."
+        " \"--shard 2/4\". For splitting DIRS among several hosts or"
+        " processes, each passing the same DIRS and N. A stable hash of each"
+        " album directory path, relative to its DIRS root, selects its shard so"
+        " the shards do not change as album directories are added or removed."
+        " Each shard prints counts and a checksum; if every shard ran then"
+        " the XOR of the checksum of each shard equals the checksum of all"
+        " shards.",
+    )
+    argg.add_argument(
+        "--shard-by",
+        dest="shard_by",
+        action="store",
+        choices=Shard.BY,
+        default=Shard.BY[0],
+        help="Select the shard of each album directory by the album directory"
+        " path, or by the top-level directory within each of DIRS (e.g. the"
+        " Artist directory). \"top\" does not walk the top-level directories"
+        " of other shards. (default: %(default)s)",
+    )
+
+    argg = parser.add_argument_group("Watch")
+    argg.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        default=False,
+        help="After processing DIRS, keep running and process album"
+        " directories as they are added or changed. Uses inotify on Linux,"
+        " otherwise polls for changes. Press Ctrl+C to stop.",
+    )
+    argg.add_argument(
+        "--watch-poll",
+        dest="watch_poll",
+        action="store",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Poll for changes every SECONDS instead of using inotify. Use for"
+        " network filesystems, e.g. NFS, which do not report changes made by"
+        " other hosts. Implies --watch.",
+    )
+    argg.add_argument(
+        "--watch-settle",
+        dest="watch_settle",
+        action="store",
+        type=float,
+        default=WatchOpts().settle,
+        metavar="SECONDS",
+        help="Process a changed directory after it has been unchanged for"
+        " SECONDS, i.e. wait for an album copy or rip to finish."
+        " (default: %(default)s)",
+    )
+
+    argg = parser.add_argument_group("Journal")
+    argg.add_argument(
+        "--journal",
+        dest="journal",
+        action="store_true",
+        default=False,
+        help="Keep a journal of album directories done, so an interrupted run"
+        " may be resumed with --resume. The journal is stored in the user"
+        " cache directory, one journal per DIRS. Upon SIGINT (Ctrl+C) or"
+        " SIGTERM, album directories in progress are finished and journaled"
+        " before exiting.",
+    )
+    argg.add_argument(
+        "--journal-file",
+        dest="journal_file",
+        action="store",
+        default=None,
+        help="Keep the journal in this file. Implies --journal.",
+    )
+    argg.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        default=False,
+        help="Skip album directories already in the journal of a prior run,"
+        " and add to that journal. Implies --journal.",
+    )
+
     argg = parser.add_argument_group("Debugging and Miscellanea")
     argg.add_argument("-v", "--version", action="version", version=__version__)
     argg.add_argument(
@@ -3319,11 +6079,6 @@ Shortcomings:
 
 - --search-discogs can only retrieve jpg file no matter the --image-type passed.
 
-- Multi-threading is only a rudimentary implementation. Does not efficiently queue
-  non-overlapping tasks, i.e. the artist-album directory search phase must entirely
-  finish before the album cover search phase begins, e.g. will not do HTTP searches
-  as soon as possible.
-
 PyPi project: %s
 Source code: %s
 
@@ -3388,6 +6143,55 @@ Inspired by the program coverlovin."""
             log.error("MusicBrainz library must be installed\n" "   pip install musicbrainzngs")
             raise err
 
+    if args.engine_concurrency < 1:
+        parser.error("--engine-concurrency must be 1 or more")
+    if args.walk_threads < 1:
+        parser.error("--walk-threads must be 1 or more")
+
+    if args.tag_cache_max < 1:
+        parser.error("--tag-cache-max must be 1 or more")
+    if args.tag_processes < 0:
+        parser.error("--tag-processes must be 0 or more")
+    if args.tag_chunksize < 1:
+        parser.error("--tag-chunksize must be 1 or more")
+    if args.max_depth is not None and args.max_depth < 0:
+        parser.error("--max-depth must be 0 or more")
+    shard = None
+    if args.shard is not None:
+        match = re.match(r"^(\d+)/(\d+)$", args.shard)
+        if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+            parser.error('--shard must be "I/N" where 1 <= I <= N, e.g. "1/4"')
+        shard = Shard(int(match.group(1)) - 1, int(match.group(2)), args.shard_by)
+    journal_path = None
+    if args.journal_file:
+        journal_path = Path(args.journal_file)
+    elif args.journal or args.resume:
+        # one journal per DIRS
+        dirs_hash = hashlib.sha1(
+            "\n".join(str(Path(d_).resolve()) for d_ in args.dirs[0]).encode(
+                "utf-8", "surrogateescape"
+            )
+        ).hexdigest()[:16]
+        journal_path = cache_dir().joinpath(
+            "%s-%s%s" % (Path(Journal.FILE_NAME).stem, dirs_hash, Path(Journal.FILE_NAME).suffix)
+        )
+    if args.watch_poll < 0:
+        parser.error("--watch-poll must be 0 or more")
+    if args.watch_settle < 0:
+        parser.error("--watch-settle must be 0 or more")
+
+    index_path = None
+    if args.scan_index_file:
+        index_path = Path(args.scan_index_file)
+    elif args.scan_index or args.scan_index_refresh:
+        index_path = cache_dir().joinpath(ScanIndex.FILE_NAME)
+
+    tagcache_path = None
+    if args.tag_cache_file:
+        tagcache_path = Path(args.tag_cache_file)
+    elif args.tag_cache:
+        tagcache_path = cache_dir().joinpath(TagCache.FILE_NAME)
+
     loglevel = logging.WARNING
     if args.debug == 1:
         loglevel = logging.INFO
@@ -3410,6 +6214,25 @@ Inspired by the program coverlovin."""
         args.referer,
         WrOpts(args.overwrite, args.test),
         loglevel,
+        WalkOpts(
+            threads=args.walk_threads,
+            index_path=index_path,
+            index_refresh=args.scan_index_refresh,
+            tagcache_path=tagcache_path,
+            tagcache_max=args.tag_cache_max,
+            tag_processes=args.tag_processes,
+            tag_chunksize=args.tag_chunksize,
+            excludes=tuple(args.excludes),
+            max_depth=args.max_depth,
+            shard=shard,
+        ),
+        WatchOpts(
+            watch=args.watch or bool(args.watch_poll),
+            poll=args.watch_poll,
+            settle=args.watch_settle,
+        ),
+        JournalOpts(journal_path, args.resume),
+        SearchOpts(engine=args.engine, concurrency=args.engine_concurrency),
     )
 
 
@@ -3428,30 +6251,88 @@ def main() -> int:
         referer,
         wropts,
         loglevel,
+        walkopts,
+        watchopts,
+        journalopts,
+        searchopts,
     ) = parse_args_opts()
 
     log.setLevel(loglevel)
 
-    # XXX: task queuing does not adequately distinguish SearcherMedium.DISK
-    #      tasks and SearcherMedium.NETWORK tasks
+    # upon the first SIGINT or SIGTERM, stop queuing tasks and let the tasks
+    # in progress finish. Upon the second, stop now.
+    shutdown = threading.Event()
+
+    def on_signal(signum: int, frame: Any) -> None:
+        if shutdown.is_set():
+            # drop the queued work, keep what is journaled, and exit without
+            # waiting on the executor threads
+            print("\nReceived signal %d again, stopping now." % signum, file=sys.stderr)
+            engine.cancel()
+            if journal is not None:
+                journal.close()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(128 + signum)
+        print(
+            "\nReceived signal %d, finishing album directories in progress…"
+            " (repeat to stop now)" % signum,
+            file=sys.stderr,
+        )
+        shutdown.set()
+
+    journal = None
+    journaled: Dict[Path, Dict[str, Any]] = {}
+    if journalopts.path is not None:
+        if journalopts.resume:
+            journaled = Journal.load(journalopts.path)
+            print(
+                'Resuming, {0} album directories done in journal "{1}".'.format(
+                    len(journaled), journalopts.path
+                )
+            )
+        journal = Journal(journalopts.path, journalopts.resume)
 
     # results of attempting to update directories
     # (SimpleQueue is an unbounded queue, new in Python 3.7!)
     result_queue: queue.SimpleQueue = queue.SimpleQueue()
 
-    # gather list of directories where Album • Artist info can be derived.
-    # 'daa' is a DirArtAlb tuple
-    daa_list = process_dirs(dirs, image_name, image_type, wropts.overwrite, result_queue)
-    print("Found {0} Album directories.".format(len(daa_list)))
-
     #
-    # do the remaining tasks in separate threads relying on a Queue
-    # to multiplex those tasks
+    # do the remaining tasks in the SearchEngine. `submit` blocks so the
+    # directory walk blocks when the SearchEngine falls behind
     #
+    engine = SearchEngine_new(searchopts, result_queue, journal, shutdown)
 
-    task_queue: queue.Queue = queue.Queue()
-    for daa in daa_list:
-        task_queue.put(
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    # gather directories where Album • Artist info can be derived.
+    # Each directory is queued as a task as soon as it is found.
+    # 'daa' is a DirArtAlb tuple
+    if walkopts.index_path is not None:
+        walkopts = attr.evolve(
+            walkopts, index=ScanIndex(walkopts.index_path, walkopts.index_refresh)
+        )
+    if walkopts.tagcache_path is not None:
+        walkopts = attr.evolve(
+            walkopts, tagcache=TagCache(walkopts.tagcache_path, walkopts.tagcache_max)
+        )
+    if walkopts.tag_processes:
+        walkopts = attr.evolve(
+            walkopts,
+            tagpool=TagPool(walkopts.tag_processes, walkopts.tag_chunksize, walkopts.tagcache),
+        )
+    walkstats = WalkStats()
+    daa_count = 0
+    daa_journaled = 0
+
+    def queue_task(daa: DirArtAlb, resume: bool = True) -> None:
+        nonlocal daa_journaled
+        if resume and daa[0] in journaled:
+            log.debug("Journaled path '%s', skip", str(daa[0]))
+            daa_journaled += 1
+            return
+        engine.submit(
             (
                 daa,
                 image_type,
@@ -3472,35 +6353,147 @@ def main() -> int:
         )
         log.debug("Queued task path '%s'", str(daa[0]))
 
-    # When there are few directories to process then no need to start extra
-    # threads.
-    # XXX: task queues does not distinguish SearcherMedium.DISK queues and
-    #      SearcherMedium.NETWORK queues. Would be much faster if it did.
-    task_queue_thread_count = min(TASK_QUEUE_THREAD_COUNT, len(daa_list))
-    log.debug("Starting %s threads for task queue…", task_queue_thread_count)
-    for tc_ in range(task_queue_thread_count):
-        th = threading.Thread(target=process_tasks, args=(task_queue, result_queue))
-        # daemon: don't wait on threads, task_queue signals when complete
-        th.daemon = True
-        log.debug("Thread %s starting…", tc_ + 1)
-        th.start()
+    # watch before the walk so changes made to directories already walked
+    # are not missed. The `IGNORE_FILE_NAME` files are not read for every
+    # watched directory, those directories are watched but not processed
+    watcher: Optional[DirWatcher] = None
+    if watchopts.watch:
+        watcher = DirWatcher_new(
+            dirs,
+            watchopts.poll,
+            lambda dirp: walk_rules(dirs, dirp, walkopts, read=False) is None,
+        )
 
-    # `.join` returns when task_queue is empty of tasks (task_done)
-    task_queue.join()
-    # done with all the hard work
+    for daa in process_dirs_iter(
+        dirs, image_name, image_type, wropts.overwrite, result_queue, walkopts, walkstats
+    ):
+        if shutdown.is_set():
+            break
+        daa_count += 1
+        queue_task(daa)
+    print("Found {0} Album directories.".format(daa_count))
+    if daa_journaled:
+        print("Skipped {0} Album directories done in journal.".format(daa_journaled))
+    print("{0}.".format(walkstats))
+    if walkopts.shard is not None:
+        print("{0}.".format(walkopts.shard))
+    if walkopts.index is not None:
+        print(
+            "Scan index: {0} directories unchanged, {1} directories read.".format(
+                walkopts.index.hits, walkopts.index.misses
+            )
+        )
+    if walkopts.tagcache is not None:
+        print(
+            "Tag cache: {0} audio media files unchanged, {1} audio media files read.".format(
+                walkopts.tagcache.hits, walkopts.tagcache.misses
+            )
+        )
 
-    # pop all result from the queue into a list
     results: List[Result] = []
-    try:
-        while True:
-            result = result_queue.get_nowait()
-            results.append(result)
-    except queue.Empty:
-        pass
+
+    def pop_results(keep: bool = True) -> List[Result]:
+        """
+        pop all result from the queue, return those popped. If `keep` then
+        keep them in `results` for the results table, else record them in the
+        ScanIndex now.
+        """
+        popped = []
+        try:
+            while True:
+                popped.append(result_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if keep:
+            results.extend(popped)
+        elif walkopts.index is not None:
+            for result in popped:
+                walkopts.index.put_result(result)
+        return popped
+
+    # a signal while watching is the usual way to stop watching, not an
+    # interruption
+    watching = False
+    if watcher is not None and not shutdown.is_set():
+        watching = True
+        print(
+            "Watching {0} directories using {1}, press Ctrl+C to stop.".format(
+                len(dirs), watcher.QNAME
+            )
+        )
+        image_nt = image_name + image_type.suffix
+
+        def on_settled(dirps: List[Path]) -> None:
+            for dirp in dirps:
+                rules = walk_rules(dirs, dirp, walkopts)
+                if rules is None:
+                    log.debug('watch: ignored "%s"', dirp)
+                    continue
+                if walkopts.shard is not None and not walkopts.shard.mine(
+                    walk_root(dirs, dirp), dirp, count=False
+                ):
+                    log.debug('watch: not in shard "%s"', dirp)
+                    continue
+                # the sub-directories of dirp are passed separately as needed
+                for daa in process_dir_iter(
+                    dirp,
+                    image_nt,
+                    wropts.overwrite,
+                    result_queue,
+                    set(),
+                    index=walkopts.index,
+                    recurse=False,
+                    tagcache=walkopts.tagcache,
+                    tagpool=walkopts.tagpool,
+                    rules=rules,
+                ):
+                    queue_task(daa, resume=False)
+            # results are printed as they come, not kept for the results table
+            for r_ in pop_results(keep=False):
+                print(
+                    "{0} {1} {2} {3}".format(
+                        "✓" if r_ else "✗",
+                        str_ArtAlb(r_.artalb) if r_.artalb else "",
+                        r_.message,
+                        r_.image_path if r_ else r_.image_path.parent,
+                    ),
+                    flush=True,
+                )
+
+        try:
+            watch_dirs(watcher, watchopts.settle, on_settled, shutdown)
+        except KeyboardInterrupt:
+            print()
+    if watcher is not None:
+        watcher.close()
+
+    engine.close()
+    # done with all the hard work
+
+    pop_results()
+    if journal is not None:
+        journal.close()
+    if watching:
+        print("Stopped watching.")
+    elif shutdown.is_set():
+        print(
+            "Interrupted, album directories not yet done were skipped."
+            + (" Resume with --resume." if journal is not None else ""),
+        )
+
+    if walkopts.index is not None:
+        for result in results:
+            walkopts.index.put_result(result)
+        walkopts.index.close()
+    if walkopts.tagpool is not None:
+        walkopts.tagpool.close()
+    if walkopts.tagcache is not None:
+        walkopts.tagcache.close()
 
     # print results and exit gracefully
     if not results:
-        print("No album cover images could be found.")
+        if not watching:
+            print("No album cover images could be found.")
         return 0
 
     results_table = []
@@ -16,14 +16,25 @@ __author__ = "James Thomas Moon"
 __url__ = "https://github.com/jtmoon79/coverlovin2/test"
 
 
+import asyncio
+import concurrent.futures
+import http.server
+import json
 import os
 import logging
 from pathlib import Path
 import tempfile
 import typing
 import queue
+import shutil
+import sys
+import threading
+import time
 
 import pytest
+import requests
+
+import coverlovin2.app
 
 from ..app import (
     Artist,
@@ -38,6 +49,8 @@ from ..app import (
     ImageType,
     Result,
     WrOpts,
+    WalkOpts,
+    WalkStats,
     URL,
     SearcherMedium,
     str_AA,
@@ -58,9 +71,33 @@ from ..app import (
     ImageSearcher_MusicBrainz,
     ImageSearcher_GoogleCSE,
     ImageSearcher_Discogs,
+    artalb_from_dir_name,
+    artalb_from_files,
     process_dir,
+    process_dir_iter,
     process_dirs,
+    process_dirs_iter,
+    SearchPools,
+    SearchLoop,
+    SearchOpts,
+    Discogs_Downloader,
+    Discogs_Downloader_PAT,
+    http_get_async,
+    RateLimiter,
+    retry_after,
     parse_args_opts,
+    ScanIndex,
+    TagCache,
+    TagPool,
+    IGNORE_FILE_NAME,
+    Shard,
+    Journal,
+    ignore_rules_parse,
+    ignored,
+    DirWatcher,
+    DirWatcher_Inotify,
+    DirWatcher_Poll,
+    watch_dirs,
 )
 
 
@@ -1080,11 +1117,93 @@ class Test_ImageSearcher_GoogleCSE(object):
         assert C_isg.go()
 
 
+@pytest.fixture
+def fake_monotonic(monkeypatch):
+    """`time.monotonic` of coverlovin2.app returns `now[0]`"""
+    now = [100.0]
+    monkeypatch.setattr(coverlovin2.app.time, 'monotonic', lambda: now[0])
+    return now
+
+
+class Test_RateLimiter(object):
+
+    def test_reserve(self, fake_monotonic):
+        """requests go at once while tokens remain, then are spread at the rate"""
+        rl = RateLimiter('test', 2.0, 2)
+        assert [rl.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        # refilled at 2 per second, no more than burst
+        fake_monotonic[0] += 10.0
+        assert [rl.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+        fake_monotonic[0] += 0.5
+        assert rl.reserve() == 0.5
+        assert rl.requests == 8
+        assert rl.waited == 2.5
+
+    def test_acquire(self, fake_monotonic, monkeypatch):
+        slept = []
+        monkeypatch.setattr(coverlovin2.app.time, 'sleep', slept.append)
+        rl = RateLimiter('test', 4.0)
+        assert [rl.acquire() for _ in range(3)] == [0.0, 0.25, 0.5]
+        assert slept == [0.25, 0.5]
+
+    def test_acquire_async(self, fake_monotonic):
+        rl = RateLimiter('test', 100.0)
+
+        async def acquire():
+            return await asyncio.gather(*(rl.acquire_async() for _ in range(3)))
+        assert sorted(asyncio.run(acquire())) == [0.0, 0.01, 0.02]
+
+    def test_update_penalize(self, fake_monotonic):
+        rl = RateLimiter('test', 1.0, 5)
+        rl.update(120, 0, 60.0)
+        assert rl.rate == 2.0
+        assert rl.reserve() == 0.5
+        # remaining does not add tokens
+        fake_monotonic[0] += 0.5
+        rl.update(None, 50, 60.0)
+        assert rl.reserve() == 0.5
+        fake_monotonic[0] += 10.0
+        rl.penalize(30.0)
+        assert rl.reserve() == 30.5
+        assert 'test' in str(rl)
+
+    @pytest.mark.parametrize('headers, default, expect',
+        (
+            pytest.param({'retry-after': '30'}, 5.0, 30.0, id='seconds'),
+            pytest.param({'retry-after': '-1'}, 5.0, 0.0, id='negative'),
+            pytest.param({'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 5.0, 5.0, id='date'),
+            pytest.param({}, 5.0, 5.0, id='none'),
+        )
+    )
+    def test_retry_after(self, headers, default, expect):
+        assert retry_after(headers, default) == expect
+
+
 class Test_ImageSearcher_Discogs(object):
     """
     TODO: complete this
     """
 
+    def test_ratelimit_update(self, fake_monotonic, monkeypatch):
+        """the X-Discogs-Ratelimit headers and 429 responses update the limiter"""
+        monkeypatch.setattr(Discogs_Downloader, 'limiter', RateLimiter('test', 1.0, 5))
+        dd = Discogs_Downloader_PAT('TOKEN', logging.DEBUG)
+        limiter = Discogs_Downloader.limiter
+        dd._ratelimit_update({'x-discogs-ratelimit': '25', 'x-discogs-ratelimit-remaining': '0'}, 200)
+        assert limiter.rate == 25 / 60
+        assert limiter.reserve() == 2.4
+        # too many requests, wait as told by Retry-After
+        fake_monotonic[0] += 2.4
+        dd._ratelimit_update({'x-discogs-ratelimit': '25', 'retry-after': '30'}, 429)
+        assert limiter.reserve() == 30.0 + 2.4
+        # too many requests, wait Ratelimit_Backoff
+        fake_monotonic[0] += 32.4
+        dd._ratelimit_update({}, 429)
+        assert limiter.reserve() == pytest.approx(Discogs_Downloader.Ratelimit_Backoff + 2.4)
+        # bad headers are ignored
+        dd._ratelimit_update({'x-discogs-ratelimit': 'many'}, 200)
+        assert limiter.rate == 25 / 60
+
     @pytest.mark.parametrize("pat_token",
         (
             "abc",
@@ -1287,8 +1406,500 @@ class Test_complex_funcs(object):
         assert daa_list == daa_list_expect
         assert qsize == sq.qsize()
 
+    def test_process_dir_iter(self):
+        """directories are yielded one at a time, before the walk finishes"""
+        sq = queue.SimpleQueue()
+        dirs_seen = set()
+        daa_iter = process_dir_iter(self.res3, 'cover.jpg', False, sq, dirs_seen)
+        assert next(daa_iter) == (self.res3a1, ArtAlb_new('artist1', 'album1'))
+        assert dirs_seen == {self.res3a1}
+        assert len(list(daa_iter)) == 4
+        assert len(dirs_seen) == 5
+
+    def test_process_dir_iter_symlink_loop(self):
+        """a symlink to an ancestor directory is not walked again"""
+        with tempfile.TemporaryDirectory() as tmpd:
+            album = Path(tmpd, 'artist1 - album1')
+            album.mkdir()
+            album.joinpath('_.mp3').write_bytes(b'')
+            try:
+                album.joinpath('loop').symlink_to(tmpd, target_is_directory=True)
+            except (OSError, NotImplementedError):
+                pytest.skip('unable to create symlink')
+            sq = queue.SimpleQueue()
+            daa_list = list(process_dir_iter(Path(tmpd), 'cover.jpg', False, sq, set()))
+            assert daa_list == [(album, ArtAlb_new('artist1', 'album1'))]
+
+    @pytest.mark.parametrize('name, artalb',
+        (
+            pytest.param('artist1 - album1', ArtAlb_new('artist1', 'album1'), id='Artist - Album'),
+            pytest.param('artist3 -- 2003 -- album3', ArtAlb_new('artist3', 'album3'), id='Artist -- Year -- Album'),
+            pytest.param('artist • 1999 • album', ArtAlb_new('artist', 'album'), id='Artist • Year • Album'),
+            pytest.param('album2a', ArtAlb_empty, id='no match'),
+        )
+    )
+    def test_artalb_from_dir_name(self, name, artalb):
+        assert artalb_from_dir_name(Path(name)) == artalb
+
+    def test_process_dirs_iter(self):
+        """same directories as process_dirs, passing the same directory twice yields once"""
+        sq = queue.SimpleQueue()
+        daa_list = list(process_dirs_iter([self.res3, self.res3], 'cover', ImageType.JPG, False, sq))
+        assert sorted(daa_list) == process_dirs([self.res3], 'cover', ImageType.JPG, False, sq)
+
+    @pytest.mark.parametrize('threads', (1, 2, 8))
+    def test_process_dirs_walk_threads(self, threads):
+        """parallel directory walk returns the same sorted list as a single-threaded walk"""
+        sq = queue.SimpleQueue()
+        walkstats = WalkStats()
+        daa_list = process_dirs([self.res3], 'cover', ImageType.JPG, False, sq, WalkOpts(threads=threads), walkstats)
+        assert daa_list == process_dirs([self.res3], 'cover', ImageType.JPG, False, sq)
+        # test_process_dir_3 has 7 directories, 5 are album directories
+        assert walkstats.dirs == 7
+        assert walkstats.albums == 5
+        assert walkstats.time_end is not None
+        assert walkstats.rate >= 0
+
+    @staticmethod
+    def _copy_tree_old(src: Path, dst: Path) -> Path:
+        """copy `src` to `dst`, directory modification times are set an hour ago"""
+        shutil.copytree(src, dst)
+        mtime = time.time() - 3600
+        for dirpath, _, _ in os.walk(dst):
+            os.utime(dirpath, (mtime, mtime))
+        return dst
+
+    @pytest.mark.parametrize('threads', (1, 4))
+    def test_process_dirs_scan_index(self, tmp_path, monkeypatch, threads):
+        """unchanged directories are not read again"""
+        res = self._copy_tree_old(self.res3, tmp_path.joinpath('res3'))
+        index_path = tmp_path.joinpath('index.sqlite3')
+        sq = queue.SimpleQueue()
+        daa_expect = process_dirs([res], 'cover', ImageType.JPG, False, sq)
+
+        with ScanIndex(index_path) as index:
+            walkopts = WalkOpts(threads=threads, index=index)
+            assert process_dirs([res], 'cover', ImageType.JPG, False, sq, walkopts) == daa_expect
+            assert (index.hits, index.misses) == (0, 7)
+
+        with ScanIndex(index_path) as index:
+            walkopts = WalkOpts(threads=threads, index=index)
+            # audio media files are not read for unchanged directories
+            with monkeypatch.context() as mp:
+                mp.setattr('coverlovin2.app.artalb_from_files', None)
+                assert process_dirs([res], 'cover', ImageType.JPG, False, sq, walkopts) == daa_expect
+            assert (index.hits, index.misses) == (7, 0)
+
+            # a new directory changes the modification time of its parent
+            res.joinpath('new').mkdir()
+            assert process_dirs([res], 'cover', ImageType.JPG, False, sq, walkopts) == daa_expect
+            assert (index.hits, index.misses) == (7 + 6, 2)
+
+        with ScanIndex(index_path, refresh=True) as index:
+            walkopts = WalkOpts(threads=threads, index=index)
+            assert process_dirs([res], 'cover', ImageType.JPG, False, sq, walkopts) == daa_expect
+            assert (index.hits, index.misses) == (0, 8)
+
+    def test_process_dirs_scan_index_ignore_file(self, tmp_path, monkeypatch):
+        """for unchanged directories, only recorded ignore files are read"""
+        src = tmp_path.joinpath('src')
+        shutil.copytree(self.res3, src)
+        src.joinpath(IGNORE_FILE_NAME).write_text('artist2/\n')
+        res = self._copy_tree_old(src, tmp_path.joinpath('res3'))
+        index_path = tmp_path.joinpath('index.sqlite3')
+        sq = queue.SimpleQueue()
+        daa_expect = process_dirs([res], 'cover', ImageType.JPG, False, sq)
+        assert len(daa_expect) == 3
+
+        with ScanIndex(index_path) as index:
+            process_dirs([res], 'cover', ImageType.JPG, False, sq, WalkOpts(index=index))
+
+        read = []
+        ignore_rules_read = coverlovin2.app.ignore_rules_read
+        monkeypatch.setattr('coverlovin2.app.ignore_rules_read', lambda dirp: read.append(dirp) or ignore_rules_read(dirp))
+        with ScanIndex(index_path) as index:
+            assert process_dirs([res], 'cover', ImageType.JPG, False, sq, WalkOpts(index=index)) == daa_expect
+            assert index.misses == 0
+        assert read == [res]
+
+    def test_artalb_from_files_tagcache(self, tmp_path, monkeypatch):
+        """unchanged audio media files are not read again"""
+        res = self._copy_tree_old(self.res3.joinpath('artist1 - album1'), tmp_path.joinpath('album1'))
+        fp = res.joinpath('_.mp3')
+        mtime = time.time() - 3600
+        os.utime(fp, (mtime, mtime))
+        expect = artalb_from_files([fp])
+        with TagCache(tmp_path.joinpath('tags.sqlite3')) as tagcache:
+            assert artalb_from_files([fp], tagcache) == expect
+            assert (tagcache.hits, tagcache.misses) == (0, 1)
+            with monkeypatch.context() as mp:
+                mp.setitem(get_artist_album, '.mp3', None)
+                assert artalb_from_files([fp], tagcache) == expect
+            assert (tagcache.hits, tagcache.misses) == (1, 1)
+            # a changed file is read again
+            os.utime(fp, (mtime + 1, mtime + 1))
+            assert artalb_from_files([fp], tagcache) == expect
+            assert (tagcache.hits, tagcache.misses) == (1, 2)
+
+    @pytest.mark.parametrize('threads', (1, 4))
+    @pytest.mark.parametrize('chunksize', (1, 3))
+    def test_process_dirs_tagpool(self, threads, chunksize):
+        """reading tags in processes returns the same sorted list as reading tags in the walk"""
+        sq = queue.SimpleQueue()
+        walkstats = WalkStats()
+        tagpool = TagPool(2, chunksize)
+        try:
+            walkopts = WalkOpts(threads=threads, tag_processes=2, tag_chunksize=chunksize, tagpool=tagpool)
+            daa_list = process_dirs([self.res3], 'cover', ImageType.JPG, False, sq, walkopts, walkstats)
+        finally:
+            tagpool.close()
+        assert daa_list == process_dirs([self.res3], 'cover', ImageType.JPG, False, sq)
+        assert walkstats.dirs == 7
+        assert walkstats.albums == 5
+
+    def test_TagPool_tagcache(self, tmp_path):
+        """tags read by the processes are cached, cached tags are not sent to the processes"""
+        res = self._copy_tree_old(self.res3.joinpath('artist1 - album1'), tmp_path.joinpath('album1'))
+        fp = res.joinpath('_.mp3')
+        mtime = time.time() - 3600
+        os.utime(fp, (mtime, mtime))
+        expect = artalb_from_files([fp])
+        with TagCache(tmp_path.joinpath('tags.sqlite3')) as tagcache:
+            tagpool = TagPool(1, 1, tagcache)
+            try:
+                for _ in range(2):
+                    tagpool.submit(res, [fp], lambda artalb: (res, artalb))
+                    assert tagpool.ready(wait=True) == [(res, expect)]
+            finally:
+                tagpool.close()
+            assert (tagcache.hits, tagcache.misses) == (1, 1)
+
+    def test_TagCache_evict(self, tmp_path):
+        mtime = time.time() - 3600
+        os.utime(tmp_path, (mtime, mtime))
+        st = os.stat(tmp_path)
+        with TagCache(tmp_path.joinpath('tags.sqlite3'), max_entries=2) as tagcache:
+            for name in ('a', 'b', 'c'):
+                tagcache.put(Path(name), st, ArtAlb_new(name, name))
+                time.sleep(0.01)
+            assert tagcache.get(Path('a'), st) == ArtAlb_new('a', 'a')
+            assert tagcache.evict() == 1
+            assert tagcache.evict() == 0
+            # 'b' was least recently used
+            assert tagcache.get(Path('b'), st) is None
+            assert tagcache.get(Path('a'), st) is not None
+            assert tagcache.get(Path('c'), st) is not None
+
+    @pytest.mark.parametrize(
+        'pattern, relpath, is_dir, expect',
+        (
+            pytest.param('@eaDir', '@eaDir', True, True),
+            pytest.param('@eaDir', 'artist/album/@eaDir', True, True),
+            pytest.param('@eaDir', 'artist/@eaDir.x', True, False),
+            pytest.param('*.mp3', 'artist/album/a.mp3', False, True),
+            pytest.param('Scans/', 'artist/album/Scans', True, True),
+            pytest.param('Scans/', 'artist/album/Scans', False, False),
+            pytest.param('/.snapshot', '.snapshot', True, True),
+            pytest.param('/.snapshot', 'artist/.snapshot', True, False),
+            pytest.param('Podcasts/*', 'Podcasts/show', True, True),
+            pytest.param('Podcasts/*', 'Podcasts/show/episode', True, False),
+            pytest.param('**/Scans', 'artist/album/Scans', True, True),
+            pytest.param('Podcasts/**', 'Podcasts/show/episode', True, True),
+            pytest.param('album[12]', 'artist/album2', True, True),
+            pytest.param('album[!12]', 'artist/album2', True, False),
+            pytest.param('\\#hash', '#hash', True, True),
+            pytest.param('# comment', '# comment', True, False),
+        )
+    )
+    def test_ignore_rules(self, pattern, relpath, is_dir, expect):
+        base = Path('/music')
+        rules = ignore_rules_parse([pattern], base)
+        assert ignored(rules, base.joinpath(relpath), is_dir) is expect
+
+    def test_ignore_rules_negate(self):
+        base = Path('/music')
+        rules = ignore_rules_parse(['album*', '!album2'], base)
+        assert ignored(rules, base.joinpath('a', 'album1'), True)
+        assert not ignored(rules, base.joinpath('a', 'album2'), True)
+
+    @pytest.mark.parametrize('threads', (1, 4))
+    @pytest.mark.parametrize(
+        'excludes, ignore_file, max_depth, albums, dirs',
+        (
+            pytest.param((), None, None, 5, 7, id='(none)'),
+            pytest.param(('artist2',), None, None, 3, 4, id='exclude dir'),
+            pytest.param(('*.ogg',), None, None, 4, 7, id='exclude file'),
+            pytest.param(('/artist2/album2a',), None, None, 4, 6, id='exclude path'),
+            pytest.param((), 'album2a\n', None, 4, 6, id='ignore file'),
+            pytest.param(('artist2',), '!album2a\n', None, 3, 4, id='ignore file in excluded dir'),
+            pytest.param((), None, 0, 0, 1, id='max depth 0'),
+            pytest.param((), None, 1, 3, 5, id='max depth 1'),
+        )
+    )
+    def test_process_dirs_exclude(self, tmp_path, threads, excludes, ignore_file, max_depth, albums, dirs):
+        res = tmp_path.joinpath('res3')
+        shutil.copytree(self.res3, res)
+        if ignore_file is not None:
+            res.joinpath('artist2', IGNORE_FILE_NAME).write_text(ignore_file)
+        sq = queue.SimpleQueue()
+        walkstats = WalkStats()
+        walkopts = WalkOpts(threads=threads, excludes=excludes, max_depth=max_depth)
+        daa_list = process_dirs([res], 'cover', ImageType.JPG, False, sq, walkopts, walkstats)
+        assert len(daa_list) == albums
+        assert walkstats.dirs == dirs
+
+    @pytest.mark.parametrize('threads', (1, 4))
+    @pytest.mark.parametrize('by', Shard.BY)
+    @pytest.mark.parametrize('count', (1, 2, 3))
+    def test_process_dirs_shard(self, threads, by, count):
+        """the shards cover all album directories once"""
+        sq = queue.SimpleQueue()
+        daa_all = process_dirs([self.res3], 'cover', ImageType.JPG, False, sq)
+        daa_shards = []
+        shards = []
+        for index in range(count):
+            shard = Shard(index, count, by)
+            walkopts = WalkOpts(threads=threads, shard=shard)
+            daa_shards += process_dirs([self.res3], 'cover', ImageType.JPG, False, sq, walkopts)
+            shards.append(shard)
+        assert sorted(daa_shards) == daa_all
+        checksum = 0
+        for shard in shards:
+            assert shard.units + shard.units_other == shards[0].units + shards[0].units_other
+            assert shard.checksum_all == shards[0].checksum_all
+            checksum ^= shard.checksum
+        assert checksum == shards[0].checksum_all
+        assert sum(shard.units for shard in shards) == shards[0].units + shards[0].units_other
+
+    def test_Shard_stable(self):
+        """the shard of a directory does not depend on the DIRS root or on other directories"""
+        shard = Shard(0, 4)
+        assert shard.unit(Path('/a'), Path('/a/artist/album')) == 'artist/album'
+        assert shard.unit(Path('/a'), Path('/a')) == '.'
+        assert Shard(0, 4, 'top').unit(Path('/a'), Path('/a/artist/album')) == 'artist'
+        assert shard.mine(Path('/a'), Path('/a/artist/album'), False) == shard.mine(Path('/b/c'), Path('/b/c/artist/album'), False)
+        assert Shard.unit_hash('artist/album') == 0x26e5949d90605f78
+
+    def test_process_dir_iter_no_recurse(self):
+        sq = queue.SimpleQueue()
+        assert list(process_dir_iter(self.res3, 'cover.jpg', False, sq, set(), recurse=False)) == []
+        album = self.res3.joinpath('artist1 - album1')
+        daa_list = list(process_dir_iter(album, 'cover.jpg', False, sq, set(), recurse=False))
+        assert [daa[0] for daa in daa_list] == [album]
+
+    @staticmethod
+    def _task(dirp: Path) -> tuple:
+        """a task for a `SearchEngine` that searches nothing"""
+        return (
+            (dirp, ArtAlb_new('artist', 'album')),
+            ImageType.JPG,
+            'cover',
+            (False, False, False, False, False),
+            GoogleCSE_Opts('', '', ImageSize.SML),
+            Discogs_Args(''),
+            '',
+            WrOpts(False, True),
+            logging.WARNING,
+        )
+
+    def test_Journal_load(self, tmp_path):
+        """each result is journaled, the journal is loaded to resume"""
+        journal_path = tmp_path.joinpath('journal.jsonl')
+        rq = queue.SimpleQueue()
+        journal = Journal(journal_path)
+        pools = SearchPools(rq, journal)
+        for name in ('a', 'b'):
+            pools.submit(self._task(tmp_path.joinpath(name)))
+        pools.close()
+        journal.close()
+        assert rq.qsize() == 2
+        # a partial line from an interrupted write is skipped
+        with open(journal_path, 'a') as f_:
+            f_.write('{"path": "/c", "ok"')
+        done = Journal.load(journal_path)
+        assert sorted(done) == [tmp_path.joinpath('a'), tmp_path.joinpath('b')]
+        assert done[tmp_path.joinpath('a')]['artist'] == 'artist'
+        assert done[tmp_path.joinpath('a')]['ok'] is False
+        # resume appends, no resume begins anew
+        Journal(journal_path, resume=True).close()
+        assert len(Journal.load(journal_path)) == 2
+        Journal(journal_path).close()
+        assert Journal.load(journal_path) == {}
+
+    def test_SearchPools_journal(self, tmp_path):
+        """each task's result is put and journaled"""
+        rq = queue.SimpleQueue()
+        journal = Journal(tmp_path.joinpath('journal.jsonl'))
+        pools = SearchPools(rq, journal, pending_max=1)
+        for name in ('a', 'b', 'c'):
+            pools.submit(self._task(tmp_path.joinpath(name)))
+        pools.close()
+        journal.close()
+        assert pools.pending == 0
+        assert rq.qsize() == 3
+        assert len(Journal.load(tmp_path.joinpath('journal.jsonl'))) == 3
+
+    def test_SearchPools_shutdown(self):
+        """after shutdown the tasks not yet started are skipped"""
+        rq = queue.SimpleQueue()
+        shutdown = threading.Event()
+        shutdown.set()
+        pools = SearchPools(rq, None, shutdown)
+        pools.submit(self._task(Path('a')))
+        pools.close()
+        assert rq.empty()
+
+    def test_Journal_flush_timer(self, tmp_path, monkeypatch):
+        """a lone result is flushed by the timer, not only by a later append"""
+        monkeypatch.setattr(Journal, 'FLUSH_INTERVAL', 0.1)
+        journal_path = tmp_path.joinpath('journal.jsonl')
+        journal = Journal(journal_path)
+        result = Result.NoSuitableImageFound(ArtAlb_new('artist', 'album'), tmp_path.joinpath('a', 'cover.jpg'), WrOpts(False, True))
+        journal.append(result)
+        time.sleep(0.05)
+        journal.append(result)
+        time.sleep(0.3)
+        assert len(journal_path.read_text().splitlines()) == 2
+        journal.close()
+        journal.close()
+
+    def test_SearchPools_cancel(self):
+        """after cancel, queued steps are dropped and no more steps begin"""
+        rq = queue.SimpleQueue()
+        pools = SearchPools(rq, disk_threads=1, network_threads=1)
+        steps = []
+        fallback = Result.NoSuitableImageFound(ArtAlb_new('artist', 'album'), Path('cover.jpg'), WrOpts(False, True))
+
+        class Slow(self._SearcherNetwork):
+            def go(self_):
+                time.sleep(0.2)
+                return super().go()
+
+        for _ in range(8):
+            pools.submit_searchers([Slow(steps), self._SearcherDisk(steps)], fallback)
+        time.sleep(0.1)
+        time_start = time.monotonic()
+        pools.cancel()
+        assert time.monotonic() - time_start < 0.1
+        time.sleep(0.3)
+        assert steps == [(SearcherMedium.NETWORK, steps[0][1])]
+        assert rq.empty()
+
+    class _Searcher(object):
+        """mixin for ImageSearcher stubs that record the thread of each step"""
+
+        found = False
+
+        def __init__(self, steps: list):
+            super().__init__(ArtAlb_new('artist', 'album'), ImageType.JPG, WrOpts(False, True), logging.WARNING)
+            self.steps = steps
+
+        def go(self):
+            self.steps.append((self.search_medium(), threading.current_thread().name))
+            if self.found:
+                return Result.Downloaded(self.artalb, self.__class__, 1, Path('cover.jpg'), self.wropts)
+            return None
+
+        def search_album_image(self) -> bytes:
+            return bytes()
+
+        @classmethod
+        def provider(cls) -> str:
+            return 'stub'
+
+    class _SearcherDisk(_Searcher, ImageSearcher_Medium_Disk):
+        pass
+
+    class _SearcherNetwork(_Searcher, ImageSearcher_Medium_Network):
+        pass
+
+    class _SearcherNetworkFound(_SearcherNetwork):
+        found = True
+
+    def test_SearchPools_medium(self):
+        """each step runs in the executor of its medium, in order, until found"""
+        rq = queue.SimpleQueue()
+        pools = SearchPools(rq, disk_threads=1, network_threads=2)
+        steps = []
+        fallback = Result.NoSuitableImageFound(ArtAlb_new('artist', 'album'), Path('cover.jpg'), WrOpts(False, True))
+        pools.submit_searchers(
+            [self._SearcherDisk(steps), self._SearcherNetwork(steps), self._SearcherNetworkFound(steps), self._SearcherDisk(steps)],
+            fallback,
+        )
+        pools.close()
+        assert [medium for medium, _ in steps] == [SearcherMedium.DISK, SearcherMedium.NETWORK, SearcherMedium.NETWORK]
+        assert steps[0][1].startswith('disk')
+        assert steps[1][1].startswith('network')
+        assert pools.steps == {SearcherMedium.DISK: 1, SearcherMedium.NETWORK: 2}
+        result = rq.get_nowait()
+        assert result and result.image_path == Path('cover.jpg')
+        # none found, the fallback result
+        steps.clear()
+        pools = SearchPools(rq)
+        pools.submit_searchers([self._SearcherDisk(steps)], fallback)
+        pools.close()
+        assert rq.get_nowait() is fallback
+
     res1e = resources.joinpath('test_process_dirs_1_empty')
 
+    @pytest.mark.parametrize(
+        'watcher_type',
+        (
+            pytest.param(
+                DirWatcher_Inotify,
+                marks=pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Linux only'),
+            ),
+            DirWatcher_Poll,
+        ),
+    )
+    def test_DirWatcher(self, tmp_path, watcher_type):
+        args = (0,) if watcher_type is DirWatcher_Poll else ()
+        watcher = watcher_type([tmp_path], *args)
+        try:
+            assert watcher.poll(0) == set()
+            album = tmp_path.joinpath('Artist', 'Album')
+            album.mkdir(parents=True)
+            album.joinpath('01.mp3').write_bytes(b'')
+            album.joinpath('cover.jpg').write_bytes(b'')
+            changed = set()
+            for _ in range(10):
+                changed |= watcher.poll(0.1)
+            assert album in changed
+            # written album cover image file is not a change
+            album.joinpath('cover.jpg').unlink()
+            album.joinpath('cover.jpg').write_bytes(b'')
+            changed = set()
+            for _ in range(3):
+                changed |= watcher.poll(0.1)
+            assert album not in changed
+        finally:
+            watcher.close()
+
+    def test_watch_dirs_debounce(self):
+        """a burst of changes to a directory is passed once, after it settles"""
+
+        class DirWatcher_Script(DirWatcher):
+            def __init__(self, script):
+                super().__init__([])
+                self.script = list(script)
+
+            def poll(self, timeout):
+                time.sleep(timeout)
+                return self.script.pop(0) if self.script else set()
+
+        d1, d2 = Path('d1'), Path('d2')
+        watcher = DirWatcher_Script([{d1}, {d1, d2}, {d1}, set()])
+        stop = threading.Event()
+        settled = []
+
+        def on_settled(dirps):
+            settled.extend(dirps)
+            if d1 in settled and d2 in settled:
+                stop.set()
+
+        watch_dirs(watcher, 0.05, on_settled, stop, idle=0.01)
+        assert sorted(settled) == [d1, d2]
+
     @pytest.mark.parametrize(
         "dirpl, image_nt, qsize, daa_list_expect",
         (
@@ -1311,12 +1922,51 @@ class Test_complex_funcs(object):
             pytest.param(['-sg', '.'], id='Google missing gkey gid'),
             pytest.param(['-sg', '--sgkey', 'foobar', '.'], id='Google missing gid'),
             pytest.param(['-sg', '--sgid ', 'foobar', '.'], id='Google missing gkey'),
+            pytest.param(['-sl', '--walk-threads', '0', '.'], id='--walk-threads 0'),
+            pytest.param(['-sl', '--max-depth', '-1', '.'], id='--max-depth -1'),
+            pytest.param(['-sl', '--shard', '0/4', '.'], id='--shard 0/4'),
+            pytest.param(['-sl', '--shard', '5/4', '.'], id='--shard 5/4'),
+            pytest.param(['-sl', '--shard', '1', '.'], id='--shard 1'),
         )
     )
     def test_parse_args_raises_SystemExit(self, args):
         with pytest.raises(SystemExit):
             parse_args_opts(args=args)
 
+    def test_parse_args_scan_index_file(self):
+        walkopts = parse_args_opts(args=['-sl', '--scan-index-file', 'foo.sqlite3', '.'])[9]
+        assert walkopts.index_path == Path('foo.sqlite3')
+        assert not walkopts.index_refresh
+        assert walkopts.index is None
+
+    def test_parse_args_exclude(self):
+        walkopts = parse_args_opts(args=['-sl', '-x', '@eaDir', '--exclude', 'Scans/', '--max-depth', '2', '.'])[9]
+        assert walkopts.excludes == ('@eaDir', 'Scans/')
+        assert walkopts.max_depth == 2
+
+    def test_parse_args_shard(self):
+        walkopts = parse_args_opts(args=['-sl', '--shard', '2/4', '--shard-by', 'top', '.'])[9]
+        assert (walkopts.shard.index, walkopts.shard.count, walkopts.shard.by) == (1, 4, 'top')
+
+    def test_parse_args_journal(self):
+        journalopts = parse_args_opts(args=['-sl', '--journal-file', 'j.jsonl', '--resume', '.'])[11]
+        assert journalopts.path == Path('j.jsonl')
+        assert journalopts.resume
+        assert parse_args_opts(args=['-sl', '.'])[11].path is None
+
+    def test_parse_args_engine(self):
+        searchopts = parse_args_opts(args=['-sl', '--engine', 'asyncio', '--engine-concurrency', '64', '.'])[12]
+        assert searchopts == SearchOpts('asyncio', 64)
+        assert parse_args_opts(args=['-sl', '.'])[12] == SearchOpts()
+        with pytest.raises(SystemExit):
+            parse_args_opts(args=['-sl', '--engine-concurrency', '0', '.'])
+
+    def test_parse_args_watch(self):
+        watchopts = parse_args_opts(args=['-sl', '--watch-poll', '30', '.'])[10]
+        assert watchopts.watch
+        assert watchopts.poll == 30
+        assert not parse_args_opts(args=['-sl', '.'])[10].watch
+
     # These tests do not need to be elaborate. Enough confidence can be had of
     # the argparse.ArgumentParser setup via code inspection; not worth the time
     # trade-off. These tests are to increase code coverage score.
@@ -1359,6 +2009,205 @@ class Test_complex_funcs(object):
             assert ret[i] == ret_expect[i], "argument %s is '%s', expected '%s'" % (i, ret[i], ret_expect[i])
 
 
+class StubHTTPServer(http.server.ThreadingHTTPServer):
+    """local stub HTTP server, serves `routes` of path to (status, headers, body)"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.barrier = None
+        """if set then each request waits for the others at this `threading.Barrier`"""
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self_):
+                self.requests.append((self_.path, dict(self_.headers)))
+                if self.barrier is not None:
+                    try:
+                        self.barrier.wait(5)
+                    except threading.BrokenBarrierError:
+                        self_.send_error(500)
+                        return
+                status, headers, body = self.routes.get(self_.path, (404, {}, b'not found'))
+                self_.send_response(status)
+                for k, v in headers.items():
+                    self_.send_header(k, v)
+                if headers.get('Transfer-Encoding') == 'chunked':
+                    self_.end_headers()
+                    for i in range(0, len(body), 3):
+                        self_.wfile.write(b'%x\r\n%s\r\n' % (len(body[i:i + 3]), body[i:i + 3]))
+                    self_.wfile.write(b'0\r\n\r\n')
+                    return
+                self_.send_header('Content-Length', str(len(body)))
+                self_.end_headers()
+                self_.wfile.write(body)
+
+            def log_message(self_, *args):
+                pass
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d' % self.server_address[1]
+
+    def json(self, path: str, obj) -> None:
+        self.routes[path] = (200, {'Content-Type': 'application/json'}, json.dumps(obj).encode())
+
+
+@pytest.fixture
+def stub_http():
+    server = StubHTTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class Test_asyncio(object):
+    """
+    Test the "asyncio" engine against a local stub HTTP server
+    """
+
+    image = b'\xff\xd8\xff image bytes'
+
+    def test_http_get_async(self, stub_http):
+        stub_http.routes['/a'] = (200, {}, b'content length')
+        stub_http.routes['/b'] = (200, {'Transfer-Encoding': 'chunked'}, b'chunked body')
+        stub_http.routes['/c'] = (302, {'Location': '/a'}, b'')
+        stub_http.routes['/d'] = (302, {'Location': '/d'}, b'')
+        resp = asyncio.run(http_get_async(stub_http.url + '/a', {'X-Test': 'yes'}))
+        assert resp.ok and resp.body == b'content length'
+        assert stub_http.requests[-1][1]['X-Test'] == 'yes'
+        assert asyncio.run(http_get_async(stub_http.url + '/b')).body == b'chunked body'
+        resp = asyncio.run(http_get_async(stub_http.url + '/c'))
+        assert resp.url == stub_http.url + '/a' and resp.body == b'content length'
+        resp = asyncio.run(http_get_async(stub_http.url + '/404'))
+        assert not resp.ok and resp.status == 404
+        with pytest.raises(ConnectionError):
+            asyncio.run(http_get_async(stub_http.url + '/d'))
+
+    def test_http_get_async_proxy(self, stub_http, monkeypatch):
+        """a proxy set by the environment is used"""
+        for name in ('no_proxy', 'NO_PROXY', 'https_proxy', 'HTTPS_PROXY', 'HTTP_PROXY'):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv('http_proxy', stub_http.url)
+        stub_http.routes['http://example.invalid/a'] = (200, {'X-Via': 'proxy'}, b'proxied')
+        resp = asyncio.run(http_get_async('http://example.invalid/a'))
+        assert resp.ok and resp.body == b'proxied' and resp.headers['x-via'] == 'proxy'
+        resp = asyncio.run(http_get_async('http://example.invalid/404'))
+        assert not resp.ok and resp.status == 404
+
+    def _musicbrainz(self, stub_http, monkeypatch, artist: str, album: str) -> None:
+        """stub MusicBrainz responses for one artist and album"""
+        monkeypatch.setattr(ImageSearcher_MusicBrainz, 'URL_WS', stub_http.url + '/ws/2')
+        monkeypatch.setattr(ImageSearcher_MusicBrainz, 'URL_CAA', stub_http.url + '/caa')
+        monkeypatch.setattr(ImageSearcher_MusicBrainz, 'limiter', RateLimiter('stub', 1000.0, 1000))
+        aid = 'id-' + artist
+        stub_http.json('/ws/2/artist/?query=%s&limit=1&fmt=json' % artist, {'artists': [{'id': aid}]})
+        stub_http.json('/ws/2/release?artist=%s&limit=100&fmt=json' % aid, {'releases': [{'id': 'r-' + album, 'title': album}, {'id': 'x', 'title': 'zzzzzzzzzzzz'}]})
+        stub_http.json('/ws/2/release-group?artist=%s&limit=100&fmt=json' % aid, {'release-groups': []})
+        stub_http.json('/caa/release/r-%s' % album, {'images': [{'image': stub_http.url + '/image/' + album}]})
+        stub_http.routes['/image/' + album] = (200, {'Content-Type': 'image/jpeg'}, self.image + album.encode())
+
+    def test_MusicBrainz_go_async(self, stub_http, monkeypatch, tmp_path):
+        self._musicbrainz(stub_http, monkeypatch, 'artist', 'album')
+        image_path = tmp_path.joinpath('cover.jpg')
+        ismb = ImageSearcher_MusicBrainz(ArtAlb_new('artist', 'album'), jpg, image_path, WrOpts(False, False), logging.DEBUG)
+        result = asyncio.run(ismb.go_async())
+        assert result
+        assert image_path.read_bytes() == self.image + b'album'
+        # no such artist
+        ismb = ImageSearcher_MusicBrainz(ArtAlb_new('nobody', 'album'), jpg, image_path, WrOpts(False, False), logging.DEBUG)
+        assert asyncio.run(ismb.go_async()) is None
+
+    def test_Discogs_go_async(self, stub_http, monkeypatch, tmp_path):
+        monkeypatch.setattr(Discogs_Downloader, 'URL_SEARCH', stub_http.url + '/database/search')
+        monkeypatch.setattr(Discogs_Downloader, 'limiter', RateLimiter('stub', 1.0, 5))
+        stub_http.json('/database/search?type=release&artist=artist&release_title=album&page=1&per_page=1',
+                       {'results': [{'cover_image': stub_http.url + '/image'}]})
+        stub_http.routes['/image'] = (200, {'X-Discogs-Ratelimit-Remaining': '50'}, self.image)
+        image_path = tmp_path.joinpath('cover.jpg')
+        isd = ImageSearcher_Discogs(ArtAlb_new('artist', 'album'), jpg, image_path, Discogs_Args('TOKEN'), WrOpts(False, False), logging.DEBUG)
+        assert asyncio.run(isd.go_async())
+        assert image_path.read_bytes() == self.image
+        assert stub_http.requests[0][1]['Authorization'] == 'Discogs token=TOKEN'
+        # the response headers updated the limiter
+        assert Discogs_Downloader.limiter.requests == 2
+        assert Discogs_Downloader.limiter.rate == 1.0
+
+    @staticmethod
+    def _discogs_concurrent(stub_http, monkeypatch, count: int) -> None:
+        """stub `count` discogs.com requests that respond only once all arrived"""
+        monkeypatch.setattr(Discogs_Downloader, 'limiter', RateLimiter('stub', 1.0, count))
+        stub_http.barrier = threading.Barrier(count)
+        headers = {'X-Discogs-Ratelimit': '60', 'X-Discogs-Ratelimit-Remaining': '55'}
+        for i in range(count):
+            stub_http.routes['/r%d' % i] = (200, headers, b'{}')
+
+    def test_Discogs_concurrent_async(self, stub_http, monkeypatch):
+        """concurrent discogs.com requests go at once while the limiter has budget"""
+        self._discogs_concurrent(stub_http, monkeypatch, 5)
+        dd = Discogs_Downloader_PAT('TOKEN', logging.DEBUG)
+
+        async def requests_():
+            return await asyncio.gather(*(
+                dd._do_request_async(stub_http.url + '/r%d' % i, dd._headers('TOKEN')) for i in range(5)
+            ))
+        responses = asyncio.run(requests_())
+        assert [r.status for r in responses] == [200] * 5
+        assert Discogs_Downloader.limiter.waited == 0.0
+
+    def test_Discogs_concurrent(self, stub_http, monkeypatch):
+        """threads' discogs.com requests go at once while the limiter has budget"""
+        self._discogs_concurrent(stub_http, monkeypatch, 5)
+        dd = Discogs_Downloader_PAT('TOKEN', logging.DEBUG)
+        with concurrent.futures.ThreadPoolExecutor(5) as executor:
+            responses = list(executor.map(
+                lambda i: dd._do_request(requests.Request('GET', stub_http.url + '/r%d' % i)), range(5)
+            ))
+        assert [r.status_code for r in responses] == [200] * 5
+        assert Discogs_Downloader.limiter.waited == 0.0
+
+    def test_GoogleCSE_go_async(self, stub_http, monkeypatch, tmp_path):
+        monkeypatch.setattr(ImageSearcher_GoogleCSE, 'google_search_api', stub_http.url + '/cse')
+        image_path = tmp_path.joinpath('cover.jpg')
+        isg = ImageSearcher_GoogleCSE(ArtAlb_new('artist', 'album'), jpg, image_path, GoogleCSE_Opts('KEY', 'ID', ImageSize.SML), 'REFERER', WrOpts(False, False), logging.DEBUG)
+        search = isg._search_url()[len(stub_http.url):]
+        stub_http.json(search, {'items': [{'link': stub_http.url + '/gone', 'image': {'thumbnailLink': stub_http.url + '/thumb'}}]})
+        stub_http.routes['/thumb'] = (200, {}, self.image)
+        assert asyncio.run(isg.go_async())
+        assert image_path.read_bytes() == self.image
+        assert stub_http.requests[0][1]['Referer'] == 'REFERER'
+
+    def test_SearchLoop(self, stub_http, monkeypatch, tmp_path):
+        """many album directories searched at once, disk searchers first"""
+        albums = ['album%02d' % i for i in range(40)]
+        for album in albums:
+            self._musicbrainz(stub_http, monkeypatch, 'artist' + album, album)
+            tmp_path.joinpath(album).mkdir()
+        rq = queue.SimpleQueue()
+        loop = SearchLoop(rq, disk_threads=2, concurrency=16)
+        for album in albums:
+            loop.submit((
+                (tmp_path.joinpath(album), ArtAlb_new('artist' + album, album)),
+                ImageType.JPG,
+                'cover',
+                (True, False, True, False, False),
+                GoogleCSE_Opts('', '', ImageSize.SML),
+                Discogs_Args(''),
+                '',
+                WrOpts(False, False),
+                logging.WARNING,
+            ))
+        loop.close()
+        assert rq.qsize() == len(albums)
+        assert loop.steps == {SearcherMedium.DISK: len(albums), SearcherMedium.NETWORK: len(albums)}
+        for album in albums:
+            assert tmp_path.joinpath(album, 'cover.jpg').read_bytes() == self.image + album.encode()
+
+
 class Test_media(object):
 
     @pytest.mark.parametrize('ti_fname, ti_ar, ti_al',